@@ -0,0 +1,196 @@
+"""
+Note: V 1.0.0 Originally, filling data methods was developed by Eric Alfaro and Javier Soley in SCILAB
+      Python version was developed by Rolando Duarte and Erick Rivera
+      Centro de Investigaciones Geofísicas (CIGEFI)
+      Universidad de Costa Rica (UCR)
+"""
+
+"""
+MIT License
+Copyright 2021 Rolando Jesus Duarte Mejias and Erick Rivera Fernandez
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software
+and associated documentation files (the "Software"), to deal in the Software without restriction,
+including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so,
+subject to the following conditions:
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR
+IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+from numpy import arange, asarray, clip, flatnonzero, float64, ix_, ones, zeros #Handling arrays
+from numpy.linalg import lstsq, solve #Least squares
+from numpy.lib.stride_tricks import sliding_window_view #Strided views
+
+
+class AutoregressionEngine:
+    """
+    Numpy engine for the simple autoregression used by Ulrich & Clayton method.
+    It works over plain arrays, so no pandas objects are created inside the iterations.
+    The results are the same as statsmodels OLS (missing = "drop", no constant)
+    within a relative tolerance of 1e-8. The arrays keep their dtype, so float32 series
+    are fitted and predicted in float32
+    """
+    def __init__(self):
+        pass
+
+    def lagMatrix(self, values, k):
+        """
+        Builds the lag matrix as a strided view of the serie (no data is copied)
+
+        Parameters
+        ----------
+        values: array
+            1-D array without missing values
+        k: int
+            number of lags
+
+        Returns
+        -------
+        lags: array
+            (n - k, k) read-only view where row t - k is [values[t - 1], ..., values[t - k]]
+        """
+        return sliding_window_view(values, k)[:-1, ::-1]
+
+    def fit(self, values, k):
+        """
+        Fits the autoregression coefficients using least squares
+
+        Parameters
+        ----------
+        values: array
+            1-D array without missing values
+        k: int
+            number of lags
+
+        Returns
+        -------
+        params: array
+            autoregression coefficients, params[i] belongs to lag i + 1
+        """
+        params, _, _, _ = lstsq(self.lagMatrix(values, k), values[k:], rcond = None)
+        return params
+
+    def predict(self, values, params, nanIndex):
+        """
+        Predicts every missing value in one pass using the previous values of the serie
+
+        Parameters
+        ----------
+        values: array
+            1-D array without missing values
+        params: array
+            autoregression coefficients
+        nanIndex: array
+            positions to predict. Positions lower than the number of lags are ignored
+
+        Returns
+        -------
+        pred: array
+            predicted values, one for each valid position in nanIndex
+        nanIndex: array
+            positions which were predicted
+        """
+        k = len(params)
+        nanIndex = asarray(nanIndex, dtype = int)
+        nanIndex = nanIndex[nanIndex >= k]
+        pred = self.lagMatrix(values, k)[nanIndex - k] @ params
+        return pred, nanIndex
+
+    def changingWindows(self, values, k, nanIndex):
+        """
+        Finds the windows of k + 1 consecutive values which contain missing values. The other windows
+        do not change between iterations, so their part of the normal equations is computed once
+
+        Parameters
+        ----------
+        values: array
+            1-D array without missing values
+        k: int
+            number of lags
+        nanIndex: array
+            positions of the missing values
+
+        Returns
+        -------
+        changing: array
+            positions of the windows with missing values, None if they are more than half of the windows
+        fixedGram: array
+            (k + 1, k + 1) product of the windows without missing values, None if changing is None
+        """
+        windowsNumber = len(values) - k
+        touched = zeros(windowsNumber, dtype = bool)
+        for offset in range(k + 1): #Window t contains the positions t, ..., t + k
+            index = asarray(nanIndex, dtype = int) - offset
+            touched[index[(index >= 0) & (index < windowsNumber)]] = True
+        changing = flatnonzero(touched)
+        if 2 * len(changing) > windowsNumber:
+            return None, None
+        fixed = ones(windowsNumber, dtype = bool)
+        fixed[changing] = False
+        windows = sliding_window_view(asarray(values, dtype = float64), k + 1)[fixed]
+        return changing, windows.T @ windows
+
+    def fitBidirectional(self, values, k, changing=None, fixedGram=None):
+        """
+        Fits the forward and backward autoregression coefficients together.
+        Both use the windows of k + 1 consecutive values, so one product of the windows gives
+        the normal equations of both fits and the serie is never reversed or copied
+
+        Parameters
+        ----------
+        values: array
+            1-D array without missing values
+        k: int
+            number of lags
+        changing, fixedGram: array
+            If they are given (see changingWindows), only the windows with missing values are multiplied
+
+        Returns
+        -------
+        forward: array
+            coefficients using previous values, forward[i] belongs to values[t - i - 1]
+        backward: array
+            coefficients using next values, backward[i] belongs to values[t + i + 1]
+        """
+        windows = sliding_window_view(asarray(values, dtype = float64), k + 1) #Row t is values[t], ..., values[t + k]
+        if changing is None:
+            gram = windows.T @ windows #Normal equations are always accumulated in float64
+        else:
+            windows = windows[changing]
+            gram = fixedGram + windows.T @ windows
+        forwardLags, backwardLags = arange(k - 1, -1, -1), arange(1, k + 1)
+        forward = solve(gram[ix_(forwardLags, forwardLags)], gram[forwardLags, k])
+        backward = solve(gram[ix_(backwardLags, backwardLags)], gram[backwardLags, 0])
+        return forward, backward
+
+    def predictBidirectional(self, values, forward, backward, nanIndex):
+        """
+        Blends the forward and backward predictions of the missing values as Ulrich & Clayton method does:
+        the mean of both predictions, only the backward one in the first k positions
+        and only the forward one in the last k positions
+
+        Parameters
+        ----------
+        values: array
+            1-D array without missing values
+        forward, backward: array
+            coefficients of fitBidirectional
+        nanIndex: array
+            positions of the missing values
+
+        Returns
+        -------
+        pred: array
+            blended prediction of each position in nanIndex
+        """
+        k, n = len(forward), len(values)
+        windows = sliding_window_view(values, k + 1)
+        nanIndex = asarray(nanIndex, dtype = int)
+        #Positions without previous (next) k values get a zero forward (backward) weight, their windows are only clipped
+        forwardWeight = (nanIndex >= k) * (1 + (nanIndex >= n - k)) / 2
+        backwardWeight = (nanIndex < n - k) * (1 + (nanIndex < k)) / 2
+        return (forwardWeight * (windows[clip(nanIndex - k, 0, n - k - 1), k - 1::-1] @ forward)
+                + backwardWeight * (windows[clip(nanIndex, 0, n - k - 1), 1:] @ backward))
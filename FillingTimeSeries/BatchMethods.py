@@ -0,0 +1,215 @@
+"""
+Note: V 1.0.0 Originally, filling data methods was developed by Eric Alfaro and Javier Soley in SCILAB
+      Python version was developed by Rolando Duarte and Erick Rivera
+      Centro de Investigaciones Geofísicas (CIGEFI)
+      Universidad de Costa Rica (UCR)
+"""
+
+"""
+MIT License
+Copyright 2021 Rolando Jesus Duarte Mejias and Erick Rivera Fernandez
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software
+and associated documentation files (the "Software"), to deal in the Software without restriction,
+including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so,
+subject to the following conditions:
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR
+IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor #Parallel datasets
+from os import cpu_count
+from time import perf_counter
+from traceback import format_exc, format_exception
+from pandas import DataFrame #Handles datasets
+from FillingTimeSeries.FillingMethods import Autoregression, ComponentsAutoregression, PrincipalComponentAnalysis
+
+
+class BatchResult:
+    """
+    Result of one dataset of a batch
+
+    Attributes
+    ----------
+    key: object
+        position of the dataset, its key in a dictionary or its group
+    df: pandas dataframe
+        filled dataframe, None if there was an error
+    error: str
+        traceback of the error, None if the dataset was filled
+    seconds: float
+        time spent filling the dataset
+    report: FillingReport
+        convergence and timing information of the method, None if there was an error
+    """
+    def __init__(self, key, df=None, error=None, seconds=0.0, report=None):
+        self.key, self.df, self.error, self.seconds, self.report = key, df, error, seconds, report
+
+    @property
+    def ok(self):
+        """
+        True if the dataset was filled
+        """
+        return self.error is None
+
+    def __repr__(self):
+        state = "ok" if self.ok else "error"
+        return "BatchResult(key=" + repr(self.key) + ", " + state + ", seconds=" + format(self.seconds, ".3f") + ")"
+
+
+class BatchFilling:
+    """
+    Fills many independent datasets with the same method and parameters
+
+    Parameters
+    ----------
+    method: str
+        "ULCLMethod", "PCAMethod" or "FullMethod"
+    n_jobs: int
+        Number of workers. -1 uses all the processors
+    executor: str
+        "process" or "thread" pool used when n_jobs is not 1
+    **params:
+        Parameters of the method (lags, components, tol, itermax, valueMin, ...)
+    """
+    methods = ("ULCLMethod", "PCAMethod", "FullMethod")
+
+    def __init__(self, method="FullMethod", n_jobs=1, executor="process", **params):
+        if method not in self.methods:
+            raise AttributeError("method must be 'ULCLMethod', 'PCAMethod' or 'FullMethod'")
+        elif n_jobs == 0 or n_jobs < -1:
+            raise AttributeError("n_jobs must be 'int' greater than 0 or -1")
+        elif executor not in ("process", "thread"):
+            raise AttributeError("executor must be 'process' or 'thread'")
+        elif "returnReport" in params or "callback" in params:
+            raise AttributeError("returnReport and callback are not supported, the report is in BatchResult.report")
+        else:
+            self.method, self.params, self.executor = method, params, executor
+            self.n_jobs = cpu_count() if n_jobs == -1 else n_jobs
+
+    def datasets(self, data, groupBy=None, index=None, columns=None, values=None):
+        """
+        Gets the (key, dataframe) pairs of the batch
+
+        Parameters
+        ----------
+        data: iterable of dataframes, dictionary of dataframes or long-format dataframe
+            Datasets of the batch
+        groupBy: str or list
+            Columns with the group of each row of a long-format dataframe
+        index, columns, values: str
+            Columns of a long-format dataframe with the time, the station and the value
+
+        Returns
+        -------
+        datasets: generator
+            (key, dataframe) pairs in input order. The dataframes of a long-format dataframe keep the time as index.
+            If a group cannot be pivoted (for example it has duplicate rows), its exception is given instead of the dataframe
+        """
+        if groupBy is not None:
+            if not isinstance(data, DataFrame) or index is None or columns is None or values is None:
+                raise AttributeError("groupBy needs a long-format dataframe and index, columns and values")
+            for key, group in data.groupby(groupBy, sort = False):
+                try:
+                    yield key, group.pivot(index = index, columns = columns, values = values)
+                except Exception as error: #The other groups are still filled
+                    yield key, error
+        elif isinstance(data, dict):
+            yield from data.items()
+        elif isinstance(data, DataFrame):
+            yield 0, data
+        else:
+            yield from enumerate(data)
+
+    def fill(self, data, groupBy=None, index=None, columns=None, values=None):
+        """
+        Fills every dataset of the batch. At most 2 * n_jobs datasets are kept in memory at the same time
+
+        Parameters
+        ----------
+        data: iterable of dataframes, dictionary of dataframes or long-format dataframe
+            Datasets of the batch
+        groupBy: str or list
+            Columns with the group of each row of a long-format dataframe
+        index, columns, values: str
+            Columns of a long-format dataframe with the time, the station and the value
+
+        Returns
+        -------
+        results: generator
+            BatchResult of each dataset in input order. Errors are reported in BatchResult.error,
+            including the errors of the pool (for example a worker killed or a dataset which cannot be pickled)
+        """
+        datasets = self.datasets(data, groupBy = groupBy, index = index, columns = columns, values = values)
+        if self.n_jobs <= 1:
+            for key, df in datasets:
+                yield _errorResult(key, df) if isinstance(df, Exception) else _batchWorker((key, df, self.method, self.params))
+            return
+        Executor = ProcessPoolExecutor if self.executor == "process" else ThreadPoolExecutor
+        with Executor(max_workers = self.n_jobs) as pool:
+            pending = deque()
+            for key, df in datasets:
+                future = Future()
+                if isinstance(df, Exception):
+                    future.set_result(_errorResult(key, df))
+                else:
+                    try:
+                        future = pool.submit(_batchWorker, (key, df, self.method, self.params))
+                    except Exception as error: #A broken pool does not accept more datasets
+                        future.set_exception(error)
+                pending.append((key, future))
+                if len(pending) >= 2 * self.n_jobs:
+                    yield _batchResult(*pending.popleft())
+            while pending:
+                yield _batchResult(*pending.popleft())
+
+
+def _errorResult(key, error):
+    """
+    Result of a dataset which could not be built or filled because of an error outside _batchWorker
+    """
+    return BatchResult(key, error = "".join(format_exception(type(error), error, error.__traceback__)))
+
+
+def _batchResult(key, future):
+    """
+    Result of a dataset sent to the pool. Errors outside _batchWorker (pickling, killed workers) are reported
+    in BatchResult.error
+    """
+    try:
+        return future.result()
+    except Exception as error:
+        return _errorResult(key, error)
+
+
+def _batchWorker(task):
+    """
+    Fills one dataset of a batch
+
+    Parameters
+    ----------
+    task: tuple
+        key, dataframe, method and parameters
+
+    Returns
+    -------
+    result: BatchResult
+        filled dataframe or error of the dataset
+    """
+    key, df, method, params = task
+    begin = perf_counter()
+    try:
+        if method == "ULCLMethod":
+            filler = Autoregression(df)
+        elif method == "PCAMethod":
+            filler = PrincipalComponentAnalysis(df)
+        else:
+            filler = ComponentsAutoregression(df)
+        dfFilled = getattr(filler, method)(**params)
+        return BatchResult(key, df = dfFilled, seconds = perf_counter() - begin, report = filler.report)
+    except Exception:
+        return BatchResult(key, error = format_exc(), seconds = perf_counter() - begin)
@@ -0,0 +1,172 @@
+"""
+Note: V 1.0.0 Originally, filling data methods was developed by Eric Alfaro and Javier Soley in SCILAB
+      Python version was developed by Rolando Duarte and Erick Rivera
+      Centro de Investigaciones Geofísicas (CIGEFI)
+      Universidad de Costa Rica (UCR)
+"""
+
+"""
+MIT License
+Copyright 2021 Rolando Jesus Duarte Mejias and Erick Rivera Fernandez
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software
+and associated documentation files (the "Software"), to deal in the Software without restriction,
+including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so,
+subject to the following conditions:
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR
+IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+from collections import OrderedDict
+from hashlib import sha256
+from os import fdopen, listdir, makedirs, path, remove, replace
+from pickle import HIGHEST_PROTOCOL, dump, load
+from tempfile import mkstemp
+from threading import Lock
+from pandas.util import hash_pandas_object #Content hash of datasets
+
+
+class FillingCache:
+    """
+    Results of the filling methods keyed by the content of the dataframe and the parameters of the method.
+    The last results are kept in memory (least recently used are removed first) and, if directory is given,
+    every result is also written to disk, so other processes and later runs can reuse it
+
+    Parameters
+    ----------
+    maxsize: int
+        Maximum number of results kept in memory. 0 keeps them only on disk
+    directory: str
+        Directory of the on-disk store. None keeps the results only in memory
+    """
+    def __init__(self, maxsize=32, directory=None):
+        if maxsize < 0:
+            raise AttributeError("maxsize must be 'int' equal or greater than 0")
+        self.maxsize, self.directory = maxsize, directory
+        self.memory, self.lock = OrderedDict(), Lock()
+        self.hits, self.misses = 0, 0
+        if directory is not None:
+            makedirs(directory, exist_ok = True)
+
+    def __getstate__(self):
+        """
+        The cache is sent to other processes without the lock and the results in memory,
+        they share only the on-disk store
+        """
+        state = self.__dict__.copy()
+        del state["lock"], state["memory"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.memory, self.lock = OrderedDict(), Lock()
+
+    def key(self, df, method, params, extra=None):
+        """
+        Builds the key of a result
+
+        Parameters
+        ----------
+        df: pandas dataframe
+            input dataframe of the method
+        method: str
+            name of the method
+        params: dict
+            parameters which change the result
+        extra: array
+            other input of the method (for example, the missing values mask)
+
+        Returns
+        -------
+        key: str
+            hexadecimal SHA-256 of the content, the columns and the parameters
+        """
+        digest = sha256()
+        digest.update(hash_pandas_object(df, index = True).to_numpy().tobytes())
+        digest.update(repr((list(df.columns), [str(dtype) for dtype in df.dtypes], df.shape)).encode())
+        digest.update(repr((method, sorted(params.items()))).encode())
+        if extra is not None:
+            digest.update(extra.tobytes())
+        return digest.hexdigest()
+
+    def filePath(self, key):
+        """
+        Path of the result on disk
+        """
+        return path.join(self.directory, key + ".pkl")
+
+    def get(self, key):
+        """
+        Gets a result from memory or from disk
+
+        Returns
+        -------
+        result: tuple
+            (dataframe, FillingReport), None if the key is not stored
+        """
+        with self.lock:
+            if key in self.memory:
+                self.memory.move_to_end(key)
+                df, report = self.memory[key]
+                self.hits += 1
+                return df.copy(), report
+        if self.directory is not None and path.exists(self.filePath(key)):
+            try:
+                with open(self.filePath(key), "rb") as file:
+                    df, report = load(file)
+            except OSError: #For example, the file was removed by clear(disk = True) of another process
+                df = None
+            if df is not None:
+                self.remember(key, df, report)
+                with self.lock:
+                    self.hits += 1
+                return df.copy(), report
+        with self.lock:
+            self.misses += 1
+        return None
+
+    def put(self, key, df, report):
+        """
+        Stores a result in memory and on disk. The dataframe is copied, so later changes
+        (for example, in an output memmap) do not change the cache. If the disk cannot be written,
+        the result is only stored in memory
+        """
+        df = df.copy(deep = True) #Memory-mapped values are read into memory
+        self.remember(key, df, report)
+        if self.directory is not None:
+            #Each write has its own temporal file, so threads and processes storing the same key do not collide
+            temporal = None
+            try:
+                handle, temporal = mkstemp(dir = self.directory, prefix = key + ".", suffix = ".tmp")
+                with fdopen(handle, "wb") as file:
+                    dump((df, report), file, protocol = HIGHEST_PROTOCOL)
+                replace(temporal, self.filePath(key)) #Other processes never read a partial file
+            except OSError: #The result is only kept in memory, a later call recomputes it
+                if temporal is not None and path.exists(temporal):
+                    remove(temporal)
+
+    def remember(self, key, df, report):
+        """
+        Stores a result in memory removing the least recently used ones
+        """
+        if self.maxsize == 0:
+            return
+        with self.lock:
+            self.memory[key] = (df, report)
+            self.memory.move_to_end(key)
+            while len(self.memory) > self.maxsize:
+                self.memory.popitem(last = False)
+
+    def clear(self, disk=False):
+        """
+        Removes the results in memory and, if disk is True, the results on disk
+        """
+        with self.lock:
+            self.memory.clear()
+        if disk and self.directory is not None:
+            for name in [name for name in listdir(self.directory) if name.endswith(".pkl")]:
+                remove(path.join(self.directory, name))
+
@@ -0,0 +1,318 @@
+"""
+Note: V 1.0.0 Originally, filling data methods was developed by Eric Alfaro and Javier Soley in SCILAB
+      Python version was developed by Rolando Duarte and Erick Rivera
+      Centro de Investigaciones Geofísicas (CIGEFI)
+      Universidad de Costa Rica (UCR)
+"""
+
+"""
+MIT License
+Copyright 2021 Rolando Jesus Duarte Mejias and Erick Rivera Fernandez
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software
+and associated documentation files (the "Software"), to deal in the Software without restriction,
+including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so,
+subject to the following conditions:
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR
+IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor #Parallel files
+from os import cpu_count, makedirs
+from pathlib import Path
+from sys import exit
+from time import perf_counter
+from traceback import format_exc
+from numpy import float64, isnan, vstack #Handling arrays
+from pandas import DataFrame, concat, read_csv #Handles datasets
+#pyarrow is only imported to read or write Parquet files
+from FillingTimeSeries.BatchMethods import BatchFilling # Fills each file with the same method
+
+
+class FileFilling:
+    """
+    Fills CSV and Parquet files. Each file is read and written by chunks of rows and
+    the files are filled at the same time by a pool of workers
+
+    Parameters
+    ----------
+    method: str
+        "ULCLMethod", "PCAMethod" or "FullMethod"
+    n_jobs: int
+        Number of files filled at the same time. -1 uses all the processors
+    executor: str
+        "process" or "thread" pool used when n_jobs is not 1
+    chunksize: int
+        Rows read or written at a time
+    indexColumn: str
+        Column copied to the output without filling (for example, the dates). The other columns must be numeric
+    outputFormat: str
+        "csv" or "parquet". None keeps the format of each input file
+    **params:
+        Parameters of the method (lags, components, tol, itermax, valueMin, solver, dtype)
+    """
+    formats = ("csv", "parquet")
+
+    def __init__(self, method="FullMethod", n_jobs=1, executor="process", chunksize=100000, indexColumn=None, outputFormat=None, **params):
+        if method not in BatchFilling.methods:
+            raise AttributeError("method must be 'ULCLMethod', 'PCAMethod' or 'FullMethod'")
+        elif n_jobs == 0 or n_jobs < -1:
+            raise AttributeError("n_jobs must be 'int' greater than 0 or -1")
+        elif executor not in ("process", "thread"):
+            raise AttributeError("executor must be 'process' or 'thread'")
+        elif chunksize <= 0:
+            raise AttributeError("chunksize must be 'int' greater than 0")
+        elif outputFormat not in (None,) + self.formats:
+            raise AttributeError("outputFormat must be 'csv' or 'parquet'")
+        else:
+            self.method, self.executor, self.chunksize = method, executor, chunksize
+            self.indexColumn, self.outputFormat, self.params = indexColumn, outputFormat, params
+            self.n_jobs = cpu_count() if n_jobs == -1 else n_jobs
+
+    def files(self, inputs, pattern=None):
+        """
+        Gets the files to fill
+
+        Parameters
+        ----------
+        inputs: list
+            paths of files or directories
+        pattern: str
+            glob pattern of the files inside the directories. None takes every .csv and .parquet file
+
+        Returns
+        -------
+        files: list
+            paths of the files, the files of each directory are sorted by name
+        """
+        files = []
+        for path in map(Path, inputs):
+            if path.is_dir():
+                found = path.glob(pattern) if pattern is not None else (file for file in path.iterdir() if file.suffix[1:] in self.formats)
+                files.extend(sorted(file for file in found if file.is_file()))
+            else:
+                files.append(path)
+        return files
+
+    def outputPath(self, path, outputDirectory):
+        """
+        Path of the filled file: same name inside outputDirectory, with the suffix of outputFormat
+        """
+        suffix = path.suffix if self.outputFormat is None else "." + self.outputFormat
+        output = Path(outputDirectory) / (path.stem + suffix)
+        if output.resolve() == path.resolve():
+            raise AttributeError("the output directory must be different from the directory of " + str(path))
+        return output
+
+    def readTable(self, path):
+        """
+        Reads a CSV or Parquet file by chunks. Each chunk is converted to a float array,
+        so the text of the file is never kept in memory
+
+        Returns
+        -------
+        df: pandas dataframe
+            numeric columns of the file
+        index: pandas serie
+            indexColumn of the file, None if indexColumn is None
+        """
+        if path.suffix == ".parquet":
+            try:
+                from pyarrow.parquet import ParquetFile #Reads Parquet files by row batches
+            except ImportError:
+                raise ImportError("Parquet files need pyarrow: pip install pyarrow")
+            chunks = (batch.to_pandas() for batch in ParquetFile(path).iter_batches(batch_size = self.chunksize))
+        else:
+            chunks = read_csv(path, chunksize = self.chunksize)
+        index, values, columns = [], [], None
+        for chunk in chunks:
+            if self.indexColumn is not None:
+                index.append(chunk.pop(self.indexColumn))
+            columns = chunk.columns
+            values.append(chunk.to_numpy(dtype = self.params.get("dtype", float64)))
+        if columns is None:
+            raise AttributeError(str(path) + " has no rows")
+        df = DataFrame(vstack(values), columns = columns, copy = False)
+        return df, (concat(index, ignore_index = True) if index else None)
+
+    def writeTable(self, df, index, path):
+        """
+        Writes a CSV or Parquet file by chunks
+
+        Parameters
+        ----------
+        df: pandas dataframe
+            filled dataframe
+        index: pandas serie
+            indexColumn, written as the first column. None writes only df
+        path: Path
+            output file
+        """
+        if index is not None:
+            df = df.copy(deep = False)
+            df.insert(0, self.indexColumn, index.to_numpy())
+        if path.suffix != ".parquet":
+            df.to_csv(path, index = False, chunksize = self.chunksize)
+            return
+        try:
+            from pyarrow import Table #Columnar tables
+            from pyarrow.parquet import ParquetWriter #Writes Parquet files by row groups
+        except ImportError:
+            raise ImportError("Parquet files need pyarrow: pip install pyarrow")
+        writer = None
+        try:
+            for start in range(0, len(df), self.chunksize):
+                table = Table.from_pandas(df.iloc[start:start + self.chunksize], preserve_index = False)
+                writer = ParquetWriter(path, table.schema) if writer is None else writer
+                writer.write_table(table)
+        finally:
+            if writer is not None:
+                writer.close()
+
+    def fillFile(self, path, outputDirectory):
+        """
+        Reads, fills and writes one file inside outputDirectory (see outputPath)
+
+        Returns
+        -------
+        summary: dict
+            file, output, rows, columns, missing values, iterations, convergence, stop reason, seconds of each stage
+            and error (traceback, None if the file was filled)
+        """
+        summary = {"file": str(path), "output": None, "method": self.method, "rows": None, "columns": None, "missing": None,
+                   "iterations": None, "converged": None, "stopReason": None, "readSeconds": None, "fillSeconds": None, "writeSeconds": None, "error": None}
+        begin = perf_counter()
+        try:
+            output = self.outputPath(path, outputDirectory)
+            summary["output"] = str(output)
+            df, index = self.readTable(path)
+            summary.update(rows = df.shape[0], columns = df.shape[1], missing = int(isnan(df.to_numpy()).sum()),
+                           readSeconds = perf_counter() - begin)
+            result = next(BatchFilling(self.method, **self.params).fill([df]))
+            summary["fillSeconds"] = result.seconds
+            if not result.ok:
+                summary["error"] = result.error
+                return summary
+            reports = [result.report] + list(result.report.children.values())
+            summary["iterations"] = max([max(report.iterations.values()) for report in reports if report.iterations], default = 0)
+            summary["converged"] = result.report.converged
+            summary["stopReason"] = result.report.stopReason
+            begin = perf_counter()
+            self.writeTable(result.df, index, output)
+            summary["writeSeconds"] = perf_counter() - begin
+        except Exception:
+            summary["error"] = format_exc()
+        return summary
+
+    def fill(self, inputs, outputDirectory, pattern=None):
+        """
+        Fills every file
+
+        Parameters
+        ----------
+        inputs: list
+            paths of files or directories
+        outputDirectory: str
+            directory of the filled files, it is created if it does not exist
+        pattern: str
+            glob pattern of the files inside the directories (see files)
+
+        Returns
+        -------
+        summaries: generator
+            summary of each file (see fillFile) in input order
+        """
+        makedirs(outputDirectory, exist_ok = True)
+        tasks = [(self, path, outputDirectory) for path in self.files(inputs, pattern = pattern)]
+        n_jobs = min(self.n_jobs, len(tasks))
+        if n_jobs <= 1:
+            yield from map(_fileWorker, tasks)
+            return
+        Executor = ProcessPoolExecutor if self.executor == "process" else ThreadPoolExecutor
+        with Executor(max_workers = n_jobs) as pool:
+            #Only paths are sent to the workers, each worker reads and writes its own files
+            yield from pool.map(_fileWorker, tasks)
+
+
+def _fileWorker(task):
+    """
+    Fills one file inside a worker of FileFilling
+
+    Parameters
+    ----------
+    task: tuple
+        FileFilling, input path and output directory
+
+    Returns
+    -------
+    summary: dict
+        summary of the file (see FileFilling.fillFile)
+    """
+    filler, path, outputDirectory = task
+    return filler.fillFile(path, outputDirectory)
+
+
+def main(argv=None):
+    """
+    Command line: filling-time-series --help
+    """
+    parser = ArgumentParser(prog = "filling-time-series", description = "Fills missing values of CSV and Parquet files")
+    parser.add_argument("inputs", nargs = "+", help = "files or directories")
+    parser.add_argument("-o", "--output", required = True, help = "directory of the filled files")
+    parser.add_argument("--method", default = "FullMethod", choices = BatchFilling.methods)
+    parser.add_argument("--lags", type = int, help = "lags of ULCLMethod and FullMethod")
+    parser.add_argument("--components", type = int, help = "principal component number of PCAMethod and FullMethod")
+    parser.add_argument("--tol", type = float)
+    parser.add_argument("--itermax", type = int)
+    parser.add_argument("--value-min", dest = "valueMin", type = float)
+    parser.add_argument("--solver", help = "decomposition of PCAMethod and FullMethod (arpack, randomized, warm-arpack, subspace, gram)")
+    parser.add_argument("--dtype", choices = ("float64", "float32"))
+    parser.add_argument("--time-budget", dest = "timeBudget", type = float, help = "seconds of the iterations of each file")
+    parser.add_argument("--patience", type = int, help = "iterations without a lower residual before stopping")
+    parser.add_argument("--per-column", dest = "perColumn", action = "store_const", const = True,
+                        help = "stop updating the columns which converged (PCAMethod and FullMethod)")
+    parser.add_argument("--jobs", type = int, default = 1, help = "files filled at the same time, -1 uses all the processors")
+    parser.add_argument("--executor", default = "process", choices = ("process", "thread"))
+    parser.add_argument("--chunksize", type = int, default = 100000, help = "rows read or written at a time")
+    parser.add_argument("--index-column", help = "column copied without filling, for example the dates")
+    parser.add_argument("--format", choices = FileFilling.formats, help = "format of the filled files (default: input format)")
+    parser.add_argument("--pattern", help = "glob pattern of the files inside directories (default: *.csv and *.parquet)")
+    parser.add_argument("--summary", help = "CSV file with the summary of each file (default: OUTPUT/summary.csv)")
+    args = parser.parse_args(argv)
+
+    accepted = {"ULCLMethod": ("lags", "tol", "itermax", "valueMin", "dtype", "timeBudget", "patience"),
+                "PCAMethod": ("components", "tol", "itermax", "valueMin", "solver", "dtype", "timeBudget", "patience", "perColumn"),
+                "FullMethod": ("lags", "components", "tol", "itermax", "valueMin", "solver", "dtype", "timeBudget", "patience",
+                               "perColumn")}[args.method]
+    params = {key: value for key, value in vars(args).items()
+              if key in ("lags", "components", "tol", "itermax", "valueMin", "solver", "dtype", "timeBudget", "patience",
+                         "perColumn") and value is not None}
+    for key in params:
+        if key not in accepted:
+            parser.error("--" + key + " is not a parameter of " + args.method)
+
+    filler = FileFilling(method = args.method, n_jobs = args.jobs, executor = args.executor, chunksize = args.chunksize,
+                         indexColumn = args.index_column, outputFormat = args.format, **params)
+    summaries = []
+    for summary in filler.fill(args.inputs, args.output, pattern = args.pattern):
+        summaries.append(summary)
+        if summary["error"] is None:
+            print("{file}: {rows} x {columns}, {missing} missing values, {iterations} iterations, "
+                  "{fillSeconds:.2f} s".format(**summary))
+        else:
+            print(summary["file"] + ": " + summary["error"].strip().splitlines()[-1]) #The traceback is in the summary
+    summaryPath = args.summary if args.summary is not None else str(Path(args.output) / "summary.csv")
+    dfSummary = DataFrame(summaries, columns = list(summaries[0]) if summaries else None)
+    if summaries: #Files with errors have missing counts, which would turn the other counts into floats
+        dfSummary = dfSummary.astype({key: "Int64" for key in ("rows", "columns", "missing", "iterations")})
+    dfSummary.to_csv(summaryPath, index = False)
+    print("Summary written to " + summaryPath)
+    return 1 if any(summary["error"] is not None for summary in summaries) else 0
+
+
+if __name__ == "__main__":
+    exit(main())
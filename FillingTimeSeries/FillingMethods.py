@@ -20,15 +20,16 @@ LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRA
 IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 """
 
-from matplotlib.pyplot import errorbar, xlabel, ylabel, title, show #Graphs
-from numpy import sqrt, abs, max, delete, where, arange, all, dot, nan #Handling arrays
-from pandas import read_csv, DataFrame, options #Handles datasets
-from sklearn.decomposition import PCA #Applies principal components transformations
-from sklearn.preprocessing import StandardScaler #Normalizes data
-from statsmodels.regression.linear_model import OLS #Linear regression
-from FillingTimeSeries.PreprocessingFillingMethods import Preprocessing # Created module for data processing purporses
-
-options.mode.chained_assignment = None #Avoiding warning messages
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor #Parallel columns
+from os import cpu_count
+from numpy import sqrt, abs, max, delete, where, arange, dot, nan, float64, nonzero, zeros #Handling arrays
+from numpy.linalg import eigh, svd #Decompositions
+from pandas import DataFrame, Series #Handles datasets
+#matplotlib, scikit-learn and statsmodels are imported when they are used, so importing the package only loads numpy and pandas
+from FillingTimeSeries.PreprocessingFillingMethods import GapIndex, Preprocessing # Created module for data processing purporses
+from FillingTimeSeries.AutoregressionEngine import AutoregressionEngine # Numpy engine for autoregression
+from FillingTimeSeries.SVDEngine import SVDEngine # Decompositions for principal components method
+from FillingTimeSeries.Telemetry import FillingReport, StopControl # Convergence and timing information
 
 
 class Autoregression:
@@ -37,18 +38,20 @@ class Autoregression:
     
     Parameters
     ----------
-    df: pandas dataframe
-        Dataframe
+    df: pandas dataframe, 2-D numpy array (or memmap) or path to a .npy file
+        Dataframe. A .npy file is opened as a read-only memory map
     """
     def __init__(self, df):
-        if isinstance(df, DataFrame):
-            self.df = df.copy()
-            self.df.columns, self.preprocessing = self.df.columns.astype(str), Preprocessing() #Avoiding numpy errorExplainedVarienceors
+        self.preprocessing = Preprocessing()
+        self.df = self.preprocessing.loadData(df) #Memory-mapped arrays are not loaded in memory
+        if self.df is not None:
+            self.df.columns = self.df.columns.astype(str) #Avoiding numpy errors
             self.dfRows, self.dfColumns = self.df.shape
+            self.engine = AutoregressionEngine()
         else:
-            raise AttributeError("df must be a pandas dataframe")
+            raise AttributeError("df must be a pandas dataframe, a 2-D numpy array or a path to a .npy file")
             
-    def simpleAR(self, serie, nanIndex, k):
+    def simpleAR(self, serie, nanIndex, k, engine="numpy", report=None, dtype=float64):
         """
         Applies a simple autoregression
         
@@ -60,31 +63,177 @@ class Autoregression:
             array with missing value indexes
         k: int
             number of lags for AutoReg function
+        engine: str
+            "numpy" uses a strided lag matrix and least squares over arrays.
+            "statsmodels" uses OLS. Both engines agree within a relative tolerance of 1e-8
+        report: FillingReport
+            If it is given, the time of the fit and predict stages is added to the serie name
+        dtype: numpy dtype
+            dtype used by the numpy engine. statsmodels always fits in float64
 
         Returns
         -------
         serie: pandas serie
             pandas serie changing the missing values using nanIndex
         """
+        report = FillingReport("simpleAR") if report is None else report
+        if engine == "numpy":
+            values = serie.to_numpy(dtype = dtype)
+            with report.timer(serie.name, "fit"):
+                params = self.engine.fit(values, k)
+            with report.timer(serie.name, "predict"):
+                pred, nanIndex = self.engine.predict(values, params, nanIndex)
+                values = values.copy()
+                values[nanIndex] = pred
+            return Series(values, index = serie.index, name = serie.name)
+        elif engine != "statsmodels":
+            raise AttributeError("engine must be 'numpy' or 'statsmodels'")
+        from statsmodels.regression.linear_model import OLS #Linear regression
         serie = serie.copy()
-        shiftting = DataFrame({})
-        for i in range(1, k + 1):
-            s = "Lag" + str(i)
-            shiftting[s] = serie.copy().shift(i, fill_value = nan)
-        lags = shiftting
-        
-        model = OLS(serie, lags, missing = "drop")
-        modelFitted = model.fit()
-        tempSerie = serie.copy()
-        for index in nanIndex:
-            pred = dot(modelFitted.params.values, serie[index - k : index][::-1].values)
-            tempSerie[index] = pred
+        with report.timer(serie.name, "fit"):
+            shiftting = DataFrame({})
+            for i in range(1, k + 1):
+                s = "Lag" + str(i)
+                shiftting[s] = serie.copy().shift(i, fill_value = nan)
+            lags = shiftting
+            
+            model = OLS(serie, lags, missing = "drop")
+            modelFitted = model.fit()
+        with report.timer(serie.name, "predict"):
+            tempSerie = serie.copy()
+            for index in nanIndex:
+                pred = dot(modelFitted.params.values, serie[index - k : index][::-1].values)
+                tempSerie[index] = pred
         serie = tempSerie
         return serie
     
-    def ULCLMethod(self,  lags=1, tol=1e-1, itermax=10, valueMin=0.0):
+    def ULCLColumn(self, serie, lags=1, tol=1e-1, itermax=10, valueMin=0.0, engine="numpy", report=None, dtype=float64, control=None):
+        """
+        Ulrich & Clayton autoregression method over one serie
+        
+        Parameters
+        ----------
+        serie: pandas serie
+            pandas serie with missing values
+        lags: int
+            Lags value for autoregression
+        tol: float
+            Tolerance value of difference between previous filled serie and current filled serie
+        itermax: int
+            Maximum iterations to find a filled serie that complies tolerance condition
+        valueMin: float
+            The minimum value allowed after applying the autoregression method.
+        engine: str
+            "numpy" fills the serie in one array with the forward and backward fits together (see bidirectionalColumn).
+            "statsmodels" applies simpleAR over the serie and over a reversed copy
+        report: FillingReport
+            If it is given, the residuals and timings of the serie are saved there
+        dtype: numpy dtype
+            dtype of the filled serie and of the autoregression
+        control: StopControl
+            Stop rules (time budget and stagnation). None only uses tol and itermax.
+            When the serie stops by stagnation, the iteration with the lowest residual is returned
+
+        Returns
+        -------
+        seriePF: pandas serie
+            pandas serie using past and future values to fill missing values
+        """
+        report = FillingReport("ULCLMethod") if report is None else report
+        control = StopControl(tol, itermax) if control is None else control
+        if serie.dtype != dtype:
+            serie = serie.astype(dtype)
+        if not serie.isna().any(): #Nothing to fill, only valueMin is applied
+            report.record(serie.name, 1, 0.0)
+            report.finish(serie.name, True)
+            return serie.clip(lower = valueMin)
+        if engine == "numpy":
+            return self.bidirectionalColumn(serie, lags, valueMin, report, control)
+        pastValues, pastNanIndex = self.preprocessing.changeNanMean(serie) #Missing values -> mean value
+        futureValues, futureNanIndex = self.preprocessing.reverseChangeNanMean(serie) #Reversed dataframe
+        pastNanIndex = delete(pastNanIndex, where(pastNanIndex < lags)) #Deleting indexes values less than or equal to k value
+        futureNanIndex = delete(futureNanIndex, where(futureNanIndex < lags))
+
+        for iter in range(1, control.itermax + 1):
+            pastPred = self.simpleAR(serie = pastValues.copy(), nanIndex = pastNanIndex, k = lags, engine = engine, report = report, dtype = dtype)
+            futurePredTemp = self.simpleAR(serie = futureValues.copy(), nanIndex = futureNanIndex, k = lags, engine = engine, report = report, dtype = dtype)
+            with report.timer(serie.name, "writeback"):
+                futurePred = futurePredTemp[::-1].copy() #Reverses serie
+                futurePred.index = pastPred.index #Replacing index to original index
+                pastPred[pastPred.index < lags] = 0
+                futurePred[futurePred.index >= (len(futurePred) - lags)] = 0
+                seriePF = (pastPred + futurePred) / 2 #Serie with past and future values
+                seriePF[seriePF.index < lags] = 2 * seriePF[seriePF.index < lags]
+                seriePF[seriePF.index >= (len(futurePred) - lags)] = 2 * seriePF[seriePF.index >= (len(futurePred) - lags)]
+                difference = max(abs(pastValues - seriePF)) #difference previous prediction and current prediction
+            report.record(serie.name, iter, difference)
+            reason = control.check(serie.name, iter, difference)
+            if control.patience is not None and control.improved(serie.name, iter):
+                bestSerie = seriePF.copy()
+            if reason is not None:
+                break
+            else:
+                pastValues = seriePF.copy()
+                futureValues, _ = self.preprocessing.reverseChangeNanMean(seriePF)
+        report.finish(serie.name, reason == "converged", reason)
+        seriePF = bestSerie if reason == "stagnation" else seriePF
+        seriePF[seriePF < valueMin] = valueMin
+        seriePF.name = serie.name
+        return seriePF
+
+    def bidirectionalColumn(self, serie, lags, valueMin, report, control):
+        """
+        Ulrich & Clayton autoregression method over one serie using one array. The forward and backward
+        coefficients are fitted together and the reversed serie is never built (see AutoregressionEngine.fitBidirectional),
+        so each iteration only allocates arrays with the size of the missing values. When the missing values are few,
+        only the lag windows which contain them are used after the first iteration (see AutoregressionEngine.changingWindows)
+
+        Parameters
+        ----------
+        serie: pandas serie
+            pandas serie with missing values
+        lags, valueMin:
+            Parameters of ULCLColumn
+        report: FillingReport
+            The residuals and timings of the serie are saved there
+        control: StopControl
+            Stop rules (tol, itermax, time budget and stagnation)
+
+        Returns
+        -------
+        seriePF: pandas serie
+            pandas serie using past and future values to fill missing values
+        """
+        values, nanIndex = self.preprocessing.changeNanMean(serie) #Missing values -> mean value
+        values, nanIndex = values.to_numpy(copy = True), serie.index.get_indexer(nanIndex)
+        with report.timer(serie.name, "fit"):
+            changing, fixedGram = self.engine.changingWindows(values, lags, nanIndex)
+        for iter in range(1, control.itermax + 1):
+            with report.timer(serie.name, "fit"):
+                forward, backward = self.engine.fitBidirectional(values, lags, changing = changing, fixedGram = fixedGram)
+            with report.timer(serie.name, "predict"):
+                pred = self.engine.predictBidirectional(values, forward, backward, nanIndex)
+            with report.timer(serie.name, "writeback"):
+                difference = abs(values[nanIndex] - pred).max() if nanIndex.size else 0.0 #difference previous prediction and current prediction
+                values[nanIndex] = pred
+            report.record(serie.name, iter, difference)
+            reason = control.check(serie.name, iter, difference)
+            if control.patience is not None and control.improved(serie.name, iter):
+                bestMissing = pred #Only the missing values are kept
+            if reason is not None:
+                break
+        report.finish(serie.name, reason == "converged", reason)
+        if reason == "stagnation":
+            values[nanIndex] = bestMissing
+        values[values < valueMin] = valueMin
+        return Series(values, index = serie.index, name = serie.name)
+
+    def ULCLMethod(self,  lags=1, tol=1e-1, itermax=10, valueMin=0.0, engine="numpy", n_jobs=1, executor="process", out=None,
+                   callback=None, returnReport=False, cache=None, dtype=float64, timeBudget=None, patience=None):
         """
-        Ulrich & Clayton autoregression method and graphs with original and filled values
+        Ulrich & Clayton autoregression method and graphs with original and filled values.
+        The convergence and timing information is kept in self.report (see FillingReport)
+        and the iterations used by each column in self.iterations. Columns without missing values are not iterated
         
         Parameters
         ----------
@@ -96,11 +245,43 @@ class Autoregression:
             Maximum iterations to find a filled serie that complies tolerance condition
         valueMin: float
             The minimum value allowed after applying the autoregression method.
+        engine: str
+            "numpy" fills the serie in one array with the forward and backward fits together (see bidirectionalColumn).
+            "statsmodels" applies simpleAR over the serie and over a reversed copy
+        n_jobs: int
+            Number of workers used to fill the columns. -1 uses all the processors.
+            Columns are independent, so the result is the same as the serial run
+        executor: str
+            "process" or "thread" pool used when n_jobs is not 1
+        out: None, 2-D numpy array (or memmap) or path to a .npy file
+            If it is given, each filled column is written there as soon as it is ready,
+            so only one column is kept in memory. A path is created as a memory-mapped .npy file
+        callback: callable
+            Called after each iteration of each column with a dictionary (see FillingReport).
+            With n_jobs different from 1, it is called when each column finishes
+        returnReport: bool
+            If it is True, the FillingReport is returned next to the dataframe
+        cache: FillingCache
+            If it is given, the result is taken from the cache when the same dataframe was filled
+            with the same parameters (n_jobs and executor do not change the result)
+        dtype: numpy dtype or str
+            "float64" or "float32". float32 halves the memory of the filled dataframe and of the output file.
+            The filled values differ from float64 by about 1e-6 times the standard deviation of each column
+            (see README), so tol must be greater than that
+        timeBudget: float
+            Seconds for the whole method. When they are over, each column stops after its current iteration
+            and keeps its last values. None has no time limit
+        patience: int
+            A column stops when its residual has not improved its minimum in patience iterations,
+            keeping the values of the iteration with the lowest residual. None never stops by stagnation
 
         Returns
         -------
         dfPF: pandas-dataframe
             Pandas dataframe using past and future values to fill missing values
+        report: FillingReport
+            Only if returnReport is True. Residuals per iteration, timings per column and stage (fit, predict, writeback)
+            and why each column stopped (report.stopReasons)
         """
         if lags <= 0:
             raise AttributeError("lags must be 'int' greater than 0")
@@ -108,33 +289,102 @@ class Autoregression:
             raise AttributeError("tol must be 'float' equal or greater than 0")
         elif itermax <= 0:
             raise AttributeError("itermax must be 'int' greater than 0")
+        elif n_jobs == 0 or n_jobs < -1:
+            raise AttributeError("n_jobs must be 'int' greater than 0 or -1")
+        elif executor not in ("process", "thread"):
+            raise AttributeError("executor must be 'process' or 'thread'")
+        elif self.preprocessing.floatDtype(dtype) is None:
+            raise AttributeError("dtype must be 'float32' or 'float64'")
+        elif timeBudget is not None and timeBudget < 0:
+            raise AttributeError("timeBudget must be 'float' equal or greater than 0")
+        elif patience is not None and patience <= 0:
+            raise AttributeError("patience must be 'int' greater than 0")
         else:
-            dfPF = DataFrame({})
-            for column in self.df.columns:
-                pastValues, pastNanIndex = self.preprocessing.changeNanMean(self.df[column]) #Missing values -> mean value
-                futureValues, futureNanIndex = self.preprocessing.reverseChangeNanMean(self.df[column]) #Reversed dataframe
-                pastNanIndex = delete(pastNanIndex, where(pastNanIndex < lags)) #Deleting indexes values less than or equal to k value
-                futureNanIndex = delete(futureNanIndex, where(futureNanIndex < lags))
-
-                for iter in range(1, itermax + 1):
-                    pastPred = self.simpleAR(serie = pastValues.copy(), nanIndex = pastNanIndex, k = lags)
-                    futurePredTemp = self.simpleAR(serie = futureValues.copy(), nanIndex = futureNanIndex, k = lags)
-                    futurePred = futurePredTemp[::-1].copy() #Reverses serie
-                    futurePred.index = pastPred.index #Replacing index to original index
-                    pastPred[pastPred.index < lags] = 0
-                    futurePred[futurePred.index >= (len(futurePred) - lags)] = 0
-                    dfPF[column] = (pastPred + futurePred) / 2 #Dataframe with past and future values
-                    dfPF[column][dfPF[column].index < lags] = 2 * dfPF[column][dfPF[column].index < lags]
-                    dfPF[column][dfPF[column].index >= (len(futurePred) - lags)] = 2 * dfPF[column][dfPF[column].index >= (len(futurePred) - lags)]
-                    difference = max(abs(pastValues - dfPF[column])) #differenceerece previous prediction and current prediction
-                    if difference <= tol:
-                        break
-                    else:
-                        pastValues = dfPF[column].copy()
-                        futureValues, _ = self.preprocessing.reverseChangeNanMean(dfPF[column])
-                dfPF[column][dfPF[column] < valueMin] = valueMin
-
-            return dfPF
+            params = {"lags": lags, "tol": tol, "itermax": itermax, "valueMin": valueMin, "engine": engine,
+                      "dtype": self.preprocessing.floatDtype(dtype)}
+            if patience is not None:
+                params["patience"] = patience #Results with the default stop rules keep their cache keys
+            control = StopControl.fromBudget(tol, itermax, timeBudget = timeBudget, patience = patience)
+            columnParams = {key: value for key, value in params.items() if key != "patience"}
+            columnParams["control"] = control
+            cacheKey = None if cache is None else cache.key(self.df, "ULCLMethod", params)
+            cached = None if cache is None else cache.get(cacheKey)
+            if cached is not None:
+                dfPF, self.report = cached
+                dfPF = self.preprocessing.writeOutput(out, dfPF)
+            else:
+                outArray = self.preprocessing.openOutput(out, self.df.shape, dtype = params["dtype"])
+                self.report = FillingReport("ULCLMethod", callback = callback)
+                n_jobs = min(cpu_count() if n_jobs == -1 else n_jobs, self.dfColumns)
+                gaps = self.df.isna().any(axis = 0).to_numpy()
+                n_jobs = min(n_jobs, int(gaps.sum()))
+                if n_jobs <= 1:
+                    columnsPF = ((self.ULCLColumn(self.df[column], report = self.report, **columnParams), None) for column in self.df.columns)
+                    dfPF = self.collectColumns(columnsPF, outArray)
+                else:
+                    Executor = ProcessPoolExecutor if executor == "process" else ThreadPoolExecutor
+                    with Executor(max_workers = n_jobs) as pool:
+                        #Only columns with missing values are sent to the workers, map keeps their order
+                        filled = pool.map(_ULCLWorker, [(self.df[column], columnParams) for column in self.df.columns[gaps]])
+                        columnsPF = (next(filled) if gap else (self.ULCLColumn(self.df[column], report = self.report, **columnParams), None)
+                                     for column, gap in zip(self.df.columns, gaps))
+                        dfPF = self.collectColumns(columnsPF, outArray)
+                if cache is not None and "timeBudget" not in self.report.stopReasons.values(): #Results cut by time are not reused
+                    cache.put(cacheKey, dfPF, self.report)
+            self.iterations = self.report.iterations
+            return (dfPF, self.report) if returnReport else dfPF
+
+    def collectColumns(self, columnsPF, outArray=None):
+        """
+        Joins the filled columns in a dataframe
+
+        Parameters
+        ----------
+        columnsPF: iterable
+            (filled pandas serie, FillingReport of a worker or None) in the original column order
+        outArray: array
+            If it is given, the columns are written there one at a time
+
+        Returns
+        -------
+        dfPF: pandas-dataframe
+            Pandas dataframe with the filled columns
+        """
+        dfPF = {}
+        for columnIndex, (seriePF, columnReport) in enumerate(columnsPF):
+            if columnReport is not None:
+                self.report.merge(columnReport)
+            if outArray is None:
+                dfPF[seriePF.name] = seriePF
+            else:
+                outArray[:, columnIndex] = seriePF.to_numpy()
+        if outArray is None:
+            return DataFrame(dfPF)
+        if hasattr(outArray, "flush"):
+            outArray.flush()
+        return DataFrame(outArray, index = self.df.index, columns = self.df.columns, copy = False)
+
+
+def _ULCLWorker(task):
+    """
+    Fills one serie inside a worker of ULCLMethod
+
+    Parameters
+    ----------
+    task: tuple
+        pandas serie and ULCLColumn parameters
+
+    Returns
+    -------
+    seriePF: pandas serie
+        pandas serie using past and future values to fill missing values
+    report: FillingReport
+        residuals and timings of the serie
+    """
+    serie, params = task
+    report = FillingReport("ULCLMethod")
+    seriePF = Autoregression(serie.to_frame()).ULCLColumn(serie, report = report, **params)
+    return seriePF, report
 
 
 class PrincipalComponentAnalysis:
@@ -143,51 +393,153 @@ class PrincipalComponentAnalysis:
 
     Parameters
     ----------
-    df: pandas dataframe
-        Dataframe
+    df: pandas dataframe, 2-D numpy array (or memmap) or path to a .npy file
+        Dataframe. A .npy file is opened as a read-only memory map
+    nanIndex_columns: list
+        Missing value indexes of each column when df was already filled (for example, by the autoregression method)
     """
     def __init__(self, df, **kwargs):
-        if isinstance(df, DataFrame):
-            self.df = df.copy()
-            self.df.columns, self.preprocessing = self.df.columns.astype(str), Preprocessing() #Avoiding numpy errorExplainedVarienceors
+        self.preprocessing = Preprocessing()
+        self.df = self.preprocessing.loadData(df) #Memory-mapped arrays are not loaded in memory
+        if self.df is not None:
+            self.df.columns = self.df.columns.astype(str) #Avoiding numpy errors
             self.dfRows, self.dfColumns = self.df.shape
-            if "nanIndex_columns" in kwargs.keys():
-                self.dfMean, self.nanIndex_columns = self.df, kwargs["nanIndex_columns"]
+            self.filled = "nanIndex_columns" in kwargs.keys()
+            if self.filled:
+                self.nanIndex_columns = kwargs["nanIndex_columns"]
             else:
-                self.dfMean, self.nanIndex_columns = self.preprocessing.changeDfNanMean(self.df)
+                self.nanIndex_columns = self.preprocessing.findNanIndex(self.df) #Mean values are computed when they are used
         else:
-            raise AttributeError("df must be a pandas dataframe")
+            raise AttributeError("df must be a pandas dataframe, a 2-D numpy array or a path to a .npy file")
+
+    def meanValues(self, dtype=float64):
+        """
+        Copies the dataframe in an array changing missing values to mean values
+
+        Parameters
+        ----------
+        dtype: numpy dtype
+            dtype of the array
+
+        Returns
+        -------
+        values: array
+            array without missing values
+        """
+        if self.filled:
+            return self.df.to_numpy(dtype = dtype, copy = True)
+        return self.preprocessing.changeArrayNanMean(self.df, dtype = dtype)
+
+    @property
+    def dfMean(self):
+        """
+        Dataframe changing missing values to mean values. It is built each time it is used,
+        so no full copy is kept next to self.df
+        """
+        if self.filled:
+            return self.df
+        return DataFrame(self.meanValues(), index = self.df.index, columns = self.df.columns, copy = False)
     
-    def checkPrincipalComponents(self):
+    def explainedVarianceData(self, maxComponents=None, solver="full"):
         """
-        Graphs explained variance of principal components
+        Explained variance of principal components and their error bars, without graphs.
+        The error bars use the effective sample size of each component, from its lag-1 autocorrelation
+
+        Parameters
+        ----------
+        maxComponents: int
+            Number of principal components computed. None computes all of them
+        solver: str
+            "full": singular value decomposition of the scaled dataframe.
+            "covariance": eigenvalues of the covariance matrix (columns x columns), cheaper when there are many rows.
+            "truncated": ARPACK decomposition of the first maxComponents (maxComponents must be lower than the columns)
 
         Returns
         -------
-        upperError: int
-            Maximum value to choose principal components 
+        dfVariance: pandas dataframe
+            explained variance ("explainedVariance") and error bar ("error") of each principal component (index from 1)
         """
+        maxComponents = self.dfColumns if maxComponents is None else maxComponents
+        if maxComponents <= 0 or maxComponents > min(self.dfRows, self.dfColumns):
+            raise AttributeError("maxComponents must be 'int' between 1 and " + str(min(self.dfRows, self.dfColumns)))
+        elif solver not in ("full", "covariance", "truncated"):
+            raise AttributeError("solver must be 'full', 'covariance' or 'truncated'")
+        elif solver == "truncated" and maxComponents >= min(self.dfRows, self.dfColumns):
+            raise AttributeError("maxComponents must be lower than " + str(min(self.dfRows, self.dfColumns)) + " with 'truncated'")
         #Scalating to get the best performance using PCA
-        scale = StandardScaler()
-        dfMeanScaled = scale.fit_transform(self.dfMean)
-        pca = PCA(n_components = self.dfColumns, copy = True, svd_solver = "full", random_state = 0)
-        vectorsPCA = pca.fit_transform(dfMeanScaled)
-        explainedVariance = pca.explained_variance_
-        errorExplainedVarience = []
-
-        #Calculating error bars
-        for index in arange(0, len(explainedVariance)):
-            dfComponents = DataFrame({"Original": vectorsPCA[:, index]})
-            dfComponents["Shift"] = dfComponents.Original.shift(1)
-            corr = dfComponents.corr().iloc[0, 1]
-            nEffective = self.dfRows * (1 - corr**2) / (1 + corr**2)
-            errorExplainedVarience.append(explainedVariance[index] * sqrt(2 / nEffective))
+        dfMeanScaled, _, _ = SVDEngine(maxComponents).scale(self.meanValues())
+        if solver == "full":
+            _, singularValues, Vt = svd(dfMeanScaled, full_matrices = False)
+            explainedVariance, vectors = singularValues**2 / (self.dfRows - 1), Vt.T
+        elif solver == "covariance":
+            eigenvalues, eigenvectors = eigh(dfMeanScaled.T @ dfMeanScaled / (self.dfRows - 1))
+            explainedVariance, vectors = eigenvalues[::-1], eigenvectors[:, ::-1]
+        else:
+            from scipy.sparse.linalg import svds #Truncated decomposition
+            _, singularValues, Vt = svds(dfMeanScaled, k = maxComponents, random_state = 0)
+            order = singularValues.argsort()[::-1]
+            explainedVariance, vectors = singularValues[order]**2 / (self.dfRows - 1), Vt[order].T
+        explainedVariance = explainedVariance[:maxComponents]
+        vectorsPCA = dfMeanScaled @ vectors[:, :maxComponents]
+
+        #Calculating error bars, lag-1 autocorrelation of every component at once
+        current, previous = vectorsPCA[1:] - vectorsPCA[1:].mean(axis = 0), vectorsPCA[:-1] - vectorsPCA[:-1].mean(axis = 0)
+        corr = (current * previous).sum(axis = 0) / sqrt((current**2).sum(axis = 0) * (previous**2).sum(axis = 0))
+        nEffective = self.dfRows * (1 - corr**2) / (1 + corr**2)
+        errorExplainedVarience = explainedVariance * sqrt(2 / nEffective)
         components = arange(1, len(explainedVariance) + 1)
-        upperError = len(explainedVariance) - 1
+        dfVariance = DataFrame({"explainedVariance": explainedVariance, "error": errorExplainedVarience}, index = components)
+        dfVariance.index.name = "component"
+        return dfVariance
+
+    def suggestComponents(self, maxComponents=None, solver="covariance"):
+        """
+        Suggests the number of principal components using the error bars (North's rule of thumb):
+        the first components whose explained variance is separated from the next one by more than the error bar
+
+        Parameters
+        ----------
+        maxComponents: int
+            Number of principal components computed. None computes all of them
+        solver: str
+            Solver of explainedVarianceData
+
+        Returns
+        -------
+        components: int
+            suggested principal component number (at least 1)
+        """
+        dfVariance = self.explainedVarianceData(maxComponents = maxComponents, solver = solver)
+        explainedVariance, error = dfVariance["explainedVariance"].to_numpy(), dfVariance["error"].to_numpy()
+        separated = explainedVariance[:-1] - explainedVariance[1:] > error[:-1]
+        components = 1
+        while components < len(separated) and separated[components - 1]:
+            components += 1
+        return components
+
+    def checkPrincipalComponents(self, maxComponents=None, solver="full"):
+        """
+        Graphs explained variance of principal components. explainedVarianceData gives the same values without graphs
+
+        Parameters
+        ----------
+        maxComponents: int
+            Number of principal components computed. None computes all of them
+        solver: str
+            "full", "covariance" or "truncated" (see explainedVarianceData)
+
+        Returns
+        -------
+        upperError: int
+            Maximum value to choose principal components 
+        """
+        from matplotlib.pyplot import errorbar, xlabel, ylabel, title, show #Graphs
+        dfVariance = self.explainedVarianceData(maxComponents = maxComponents, solver = solver)
+        upperError = len(dfVariance) - 1
 
         #Plotting eigenvalues and principal components
-        errorbar(components, explainedVariance, 
-                                    yerr=errorExplainedVarience, fmt="D", color="green", 
+        errorbar(dfVariance.index, dfVariance["explainedVariance"], 
+                                    yerr=dfVariance["error"], fmt="D", color="green", 
                                     ecolor="red", capsize=10,
                                     )
         title("Explained variance vs. principal components")
@@ -196,9 +548,12 @@ class PrincipalComponentAnalysis:
         show()
         return upperError
     
-    def PCAMethod(self, components=1, tol=1e-3, itermax=1000, valueMin=0.0):
+    def PCAMethod(self, components=1, tol=1e-3, itermax=1000, valueMin=0.0, solver="arpack", out=None,
+                  callback=None, returnReport=False, cache=None, dtype=float64, timeBudget=None, patience=None, perColumn=False):
         """
-        Principal components method
+        Principal components method. The convergence and timing information is kept in self.report
+        (see FillingReport) and the iterations used in self.iterations.
+        Only the rows with missing values are reconstructed in each iteration
         
         Parameters
         ----------
@@ -210,43 +565,115 @@ class PrincipalComponentAnalysis:
             Maximum iterations to find a filled dataframe that complies tolerance condition
         valueMin: float
             The minimum value allowed after applying the principal components method.
+        solver: str
+            Decomposition used in each iteration: "arpack", "randomized", "warm-arpack", "subspace" or "gram".
+            The warm-started solvers reuse the singular vectors of the previous iteration. "gram" only uses
+            the rows with missing values in each iteration, so it is the fastest when few rows have missing values
+        out: None, 2-D numpy array (or memmap) or path to a .npy file
+            If it is given, the filled values are written there. A path is created as a memory-mapped .npy file
+        callback: callable
+            Called after each iteration with a dictionary (see FillingReport)
+        returnReport: bool
+            If it is True, the FillingReport is returned next to the dataframe
+        cache: FillingCache
+            If it is given, the result is taken from the cache when the same dataframe (and missing values)
+            was filled with the same parameters
+        dtype: numpy dtype or str
+            "float64" or "float32". float32 halves the memory of the iteration arrays and of the output file.
+            The filled values differ from float64 by about 1e-5 times the standard deviation of each column,
+            or by up to tol if the iterations stop at a different iteration (see README)
+        timeBudget: float
+            Seconds for the method. When they are over, the method stops after the current iteration
+            and keeps the last values. None has no time limit
+        patience: int
+            The method stops when the residual has not improved its minimum in patience iterations,
+            keeping the values of the iteration with the lowest residual. None never stops by stagnation
+        perColumn: bool
+            If it is True, the missing values of a column stop being updated and checked
+            when they change less than tol in one iteration
         
         Returns
         -------
         dfActual: pandas dataframe
             pandas dataframe using principal components to fill missing values
+        report: FillingReport
+            Only if returnReport is True. Residuals per iteration (key "all"), timings per stage
+            (scaling, svd, writeback) and why the method stopped (report.stopReasons)
         """
         if tol < 0:
             raise AttributeError("tol must be 'float' equal or greater than 0")
         elif itermax <= 0:
             raise AttributeError("itermax must be 'int' greater than 0")
+        elif solver not in SVDEngine.solvers:
+            raise AttributeError("solver must be one of " + ", ".join(["'" + s + "'" for s in SVDEngine.solvers]))
+        elif self.preprocessing.floatDtype(dtype) is None:
+            raise AttributeError("dtype must be 'float32' or 'float64'")
+        elif timeBudget is not None and timeBudget < 0:
+            raise AttributeError("timeBudget must be 'float' equal or greater than 0")
+        elif patience is not None and patience <= 0:
+            raise AttributeError("patience must be 'int' greater than 0")
         else:
-            dfPast = self.dfMean.copy()
-            dfActual = self.dfMean.copy()
+            nanMask = self.preprocessing.nanIndexMask(self.df, self.nanIndex_columns)
+            params = {"components": components, "tol": tol, "itermax": itermax, "valueMin": valueMin, "solver": solver,
+                      "dtype": self.preprocessing.floatDtype(dtype)}
+            if patience is not None or perColumn:
+                params.update(patience = patience, perColumn = perColumn) #Results with the default stop rules keep their cache keys
+            cacheKey = None if cache is None else cache.key(self.df, "PCAMethod", params, extra = nanMask)
+            cached = None if cache is None else cache.get(cacheKey)
+            if cached is not None:
+                dfActual, self.report = cached
+                self.iterations = self.report.iterations["all"]
+                dfActual = self.preprocessing.writeOutput(out, dfActual)
+                return (dfActual, self.report) if returnReport else dfActual
+
+            #Only one full-size array is kept between iterations: the previous values are needed only in the missing values
+            values = self.meanValues(dtype = params["dtype"])
+            missing = values[nanMask]
+            gaps = GapIndex(nanMask)
+            rowsMask = nanMask[gaps.rows] #Missing values in the reconstructed rows, in the same order as values[nanMask]
+            
+            svdEngine = SVDEngine(components = components, solver = solver)
+            self.report = FillingReport("PCAMethod", callback = callback)
+            control = StopControl.fromBudget(tol, itermax, timeBudget = timeBudget, patience = patience)
+            missingColumns = nonzero(nanMask)[1] #Column of each missing value, in the same order as values[nanMask]
+            active = slice(None) #Missing values of the columns which are still updated
             
             for iters in range(1, itermax + 1):
-                scale = StandardScaler()
-                dfPastS = scale.fit_transform(dfPast)
-                pca = PCA(n_components = components, copy = True, svd_solver = "arpack", random_state = 0)
-                dfFitS = pca.fit_transform(dfPastS)
-                dfFitS = pca.inverse_transform(dfFitS)
-                dfFit = scale.inverse_transform(dfFitS)
+                if gaps.missing == 0:
+                    reason = "converged" #Nothing to fill
+                    self.report.record("all", iters, 0.0)
+                    break
+                fit = svdEngine.reconstruct(values, report = self.report, gaps = gaps) #Only the rows with missing values
 
                 #Changing values in nan indexes using principal components
-                for columnIndex in range(0, len(dfActual.columns)):
-                    for index in self.nanIndex_columns[columnIndex]:
-                        dfActual[dfActual.columns[columnIndex]][index] = dfFit[index, columnIndex]
-                difference = abs(dfActual - dfPast).max(axis = 0)
-
-                if all(difference <= tol):
+                with self.report.timer("all", "writeback"):
+                    fitMissing = fit[rowsMask][active]
+                    del fit #The next reconstruction does not coexist with this one
+                    difference = abs(fitMissing - missing[active])
+                    missing[active] = fitMissing
+                    values[nanMask] = missing
+                    if perColumn:
+                        changing = zeros(self.dfColumns, dtype = bool)
+                        changing[missingColumns[active][difference > tol]] = True
+                        active = arange(gaps.missing)[active][changing[missingColumns[active]]]
+                residual = difference.max() if difference.size else 0.0
+                self.report.record("all", iters, residual)
+                reason = control.check("all", iters, residual)
+                if patience is not None and control.improved("all", iters):
+                    bestMissing = missing.copy()
+                if reason is not None:
                     break
-                else:
-                    dfPast = dfActual.copy()
 
-            for column in dfActual.columns:
-                dfActual[column][dfActual[column] < valueMin] = valueMin
-
-            return dfActual
+            self.report.finish("all", reason == "converged", reason)
+            self.iterations = iters
+            if reason == "stagnation":
+                values[nanMask] = bestMissing
+            values[values < valueMin] = valueMin
+            dfActual = DataFrame(values, index = self.df.index, columns = self.df.columns, copy = False)
+            if cache is not None and reason != "timeBudget": #Results cut by time are not reused
+                cache.put(cacheKey, dfActual, self.report)
+            dfActual = self.preprocessing.writeOutput(out, dfActual)
+            return (dfActual, self.report) if returnReport else dfActual
 
 
 class ComponentsAutoregression:
@@ -255,33 +682,74 @@ class ComponentsAutoregression:
     
     Parameters
     ----------
-    df: pandas dataframe
-        Dataframe
+    df: pandas dataframe, 2-D numpy array (or memmap) or path to a .npy file
+        Dataframe. A .npy file is opened as a read-only memory map
     """
     def __init__(self, df):
-        if isinstance(df, DataFrame):
-            self.df = df.copy()
-            self.df.columns, self.preprocessing = self.df.columns.astype(str), Preprocessing() #Avoiding numpy errors
+        self.preprocessing = Preprocessing()
+        self.df = self.preprocessing.loadData(df) #Memory-mapped arrays are not loaded in memory
+        if self.df is not None:
+            self.df.columns = self.df.columns.astype(str) #Avoiding numpy errors
             self.dfRows, self.dfColumns = self.df.shape
-            _, self.nanIndex_columns = self.preprocessing.changeDfNanMean(self.df)
+            self.nanIndex_columns = self.preprocessing.findNanIndex(self.df)
         else:
-            raise AttributeError("df must be a pandas dataframe")
+            raise AttributeError("df must be a pandas dataframe, a 2-D numpy array or a path to a .npy file")
 
-    def checkPrincipalComponents(self):
+    def checkPrincipalComponents(self, maxComponents=None, solver="full"):
         """
         Graphs explained variance of principal components
 
+        Parameters
+        ----------
+        maxComponents: int
+            Number of principal components computed. None computes all of them
+        solver: str
+            "full", "covariance" or "truncated" (see PrincipalComponentAnalysis.explainedVarianceData)
+
         Returns
         -------
         upperError: int
             Maximum value to choose principal components 
         """
-        upperError = PrincipalComponentAnalysis(self.df).checkPrincipalComponents()
+        upperError = PrincipalComponentAnalysis(self.df).checkPrincipalComponents(maxComponents = maxComponents, solver = solver)
         return upperError
+
+    def explainedVarianceData(self, maxComponents=None, solver="full"):
+        """
+        Explained variance of principal components and their error bars, without graphs
+
+        Parameters
+        ----------
+        maxComponents: int
+            Number of principal components computed. None computes all of them
+        solver: str
+            "full", "covariance" or "truncated" (see PrincipalComponentAnalysis.explainedVarianceData)
+
+        Returns
+        -------
+        dfVariance: pandas dataframe
+            explained variance ("explainedVariance") and error bar ("error") of each principal component (index from 1)
+        """
+        dfVariance = PrincipalComponentAnalysis(self.df).explainedVarianceData(maxComponents = maxComponents, solver = solver)
+        return dfVariance
+
+    def suggestComponents(self, maxComponents=None, solver="covariance"):
+        """
+        Suggests the number of principal components using the error bars (see PrincipalComponentAnalysis.suggestComponents)
+
+        Returns
+        -------
+        components: int
+            suggested principal component number
+        """
+        components = PrincipalComponentAnalysis(self.df).suggestComponents(maxComponents = maxComponents, solver = solver)
+        return components
     
-    def FullMethod(self, lags=1, components=1, tol=1e-3, itermax=1000, valueMin=0.0):
+    def FullMethod(self, lags=1, components=1, tol=1e-3, itermax=1000, valueMin=0.0, solver="arpack", out=None,
+                   callback=None, returnReport=False, cache=None, dtype=float64, timeBudget=None, patience=None, perColumn=False):
         """
-        Full method
+        Full method. The convergence and timing information is kept in self.report, with the reports
+        of both methods in self.report.children, and the iterations used by each method in self.iterations
         
         Parameters
         ----------
@@ -295,11 +763,35 @@ class ComponentsAutoregression:
             Maximum iterations to find a filled dataframe that complies tolerance condition
         valueMin: float
             The minimum value allowed after applying the autoregression and principal components methods.
+        solver: str
+            Decomposition used by the principal components method (see PrincipalComponentAnalysis.PCAMethod)
+        out: None, 2-D numpy array (or memmap) or path to a .npy file
+            If it is given, the autoregression writes there column by column and
+            the principal components method writes the final values over them
+        callback: callable
+            Called after each iteration of both methods with a dictionary (see FillingReport)
+        returnReport: bool
+            If it is True, the FillingReport is returned next to the dataframe
+        cache: FillingCache
+            If it is given, both stages are cached. The autoregression result only depends on lags, tol,
+            itermax and valueMin, so changing components reuses it
+        dtype: numpy dtype or str
+            "float64" or "float32", used by both methods (see PrincipalComponentAnalysis.PCAMethod)
+        timeBudget: float
+            Seconds for both methods. The principal components method gets the seconds left by the autoregression
+            and always applies at least one iteration. None has no time limit
+        patience: int
+            Stagnation rule of both methods (see PrincipalComponentAnalysis.PCAMethod)
+        perColumn: bool
+            Per-column convergence of the principal components method (see PrincipalComponentAnalysis.PCAMethod)
         
         Returns
         -------
         dfPCA: pandas dataframe
             pandas dataframe using autoregression and principal components to fill missing values
+        report: FillingReport
+            Only if returnReport is True. The reports of ULCLMethod and PCAMethod are in report.children
+            and report.stopReason says why they stopped
         """
         if lags <= 0:
             raise AttributeError("lags must be 'int' greater than 0")
@@ -309,9 +801,21 @@ class ComponentsAutoregression:
             raise AttributeError("tol must be 'float' equal or greater than 0")
         elif itermax <= 0:
             raise AttributeError("itermax must be 'int' greater than 0")
+        elif self.preprocessing.floatDtype(dtype) is None:
+            raise AttributeError("dtype must be 'float32' or 'float64'")
+        elif timeBudget is not None and timeBudget < 0:
+            raise AttributeError("timeBudget must be 'float' equal or greater than 0")
         else:
+            control = StopControl.fromBudget(tol, itermax, timeBudget = timeBudget)
             AR = Autoregression(self.df)
-            dfAR = AR.ULCLMethod(lags = lags, tol = tol, itermax = itermax, valueMin = valueMin)
+            outArray = self.preprocessing.openOutput(out, self.df.shape, dtype = self.preprocessing.floatDtype(dtype))
+            dfAR = AR.ULCLMethod(lags = lags, tol = tol, itermax = itermax, valueMin = valueMin, out = outArray, callback = callback,
+                                 cache = cache, dtype = dtype, timeBudget = timeBudget, patience = patience)
             pca = PrincipalComponentAnalysis(dfAR, nanIndex_columns = self.nanIndex_columns)
-            dfPCA = pca.PCAMethod(components = components, tol = tol, itermax = itermax, valueMin = valueMin)
-            return dfPCA  
\ No newline at end of file
+            dfPCA = pca.PCAMethod(components = components, tol = tol, itermax = itermax, valueMin = valueMin, solver = solver, out = outArray,
+                                  callback = callback, cache = cache, dtype = dtype, timeBudget = control.remaining(), patience = patience,
+                                  perColumn = perColumn)
+            self.report = FillingReport("FullMethod", callback = callback)
+            self.report.children = {"ULCLMethod": AR.report, "PCAMethod": pca.report}
+            self.iterations = {"ULCLMethod": AR.iterations, "PCAMethod": pca.iterations}
+            return (dfPCA, self.report) if returnReport else dfPCA  
\ No newline at end of file
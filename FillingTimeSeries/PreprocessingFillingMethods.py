@@ -20,6 +20,11 @@ LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRA
 IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 """
 
+from pathlib import PurePath
+from numpy import any, dtype as numpyDtype, flatnonzero, float64, isnan, load, ndarray, nonzero, zeros #Handling arrays
+from numpy.lib.format import open_memmap #Memory-mapped .npy files
+from pandas import DataFrame #Handles datasets
+
 class Preprocessing:
         """
         Preprocesses dataframe to change missing values to mean values.
@@ -27,6 +32,80 @@ class Preprocessing:
         """
         def __init__(self):
                 pass
+
+        def loadData(self, data):
+                """
+                Gets a dataframe from the input data without copying the values.
+                A path to a .npy file is opened as a read-only memory map
+                
+                Parameters
+                ----------
+                data: pandas dataframe, 2-D numpy array (or memmap) or path to a .npy file
+                        data with missing values
+                
+                Returns
+                -------
+                df: pandas dataframe
+                        dataframe sharing the values with data, None if data is not supported
+                """
+                if isinstance(data, DataFrame):
+                        return data.copy(deep = False) #The values are never modified in place
+                if isinstance(data, (str, PurePath)) and str(data).endswith(".npy"):
+                        data = load(data, mmap_mode = "r")
+                if isinstance(data, ndarray) and data.ndim == 2:
+                        return DataFrame(data, copy = False)
+                return None
+
+        def openOutput(self, out, shape, dtype=float64):
+                """
+                Gets the array where the filled values are written
+                
+                Parameters
+                ----------
+                out: None, 2-D numpy array (or memmap) or path to a .npy file
+                        output array. A path is created as a memory-mapped .npy file
+                shape: tuple
+                        shape of the filled dataframe
+                dtype: numpy dtype
+                        dtype of the memory-mapped file created from a path
+                
+                Returns
+                -------
+                outArray: array
+                        output array, None if out is None
+                """
+                if out is None:
+                        return None
+                if isinstance(out, (str, PurePath)):
+                        return open_memmap(out, mode = "w+", dtype = dtype, shape = shape)
+                if isinstance(out, ndarray) and out.shape == tuple(shape):
+                        return out
+                raise AttributeError("out must be a path to a .npy file or a numpy array with shape " + str(tuple(shape)))
+
+        def writeOutput(self, out, df):
+                """
+                Writes a filled dataframe in the output array
+                
+                Parameters
+                ----------
+                out: None, 2-D numpy array (or memmap) or path to a .npy file
+                        output array. A path is created as a memory-mapped .npy file
+                df: pandas dataframe
+                        filled dataframe
+                
+                Returns
+                -------
+                df: pandas dataframe
+                        dataframe sharing the values with the output array, df if out is None
+                """
+                values = df.to_numpy()
+                outArray = self.openOutput(out, df.shape, dtype = values.dtype)
+                if outArray is None:
+                        return df
+                outArray[:] = values
+                if hasattr(outArray, "flush"):
+                        outArray.flush()
+                return DataFrame(outArray, index = df.index, columns = df.columns, copy = False)
     
         def changeNanMean(self, serie):
                 """
@@ -87,6 +166,130 @@ class Preprocessing:
                         missing values in each column indexes 
                 """
                 df = df.copy()
-                nanIndexColumns = [df[column][df[column].isna()].index for column in df.columns]
+                nanIndexColumns = self.findNanIndex(df)
                 df.fillna(value = df.mean(axis=0), axis=0, inplace=True)   
-                return df, nanIndexColumns    
\ No newline at end of file
+                return df, nanIndexColumns
+
+        def findNanIndex(self, df):
+                """
+                Finds missing value indexes of each column without copying the dataframe
+                
+                Parameters
+                ----------
+                df: pandas dataframe
+                        pandas dataframe with missing values
+                
+                Returns
+                -------
+                nanIndexColumns: array
+                        missing values in each column indexes 
+                """
+                return [df[column][df[column].isna()].index for column in df.columns]
+
+        def nanIndexMask(self, df, nanIndexColumns):
+                """
+                Builds a boolean mask of missing values from the missing value indexes of each column.
+                Every index must be in df
+                
+                Parameters
+                ----------
+                df: pandas dataframe
+                        pandas dataframe used to find the missing values
+                nanIndexColumns: array
+                        missing values in each column indexes 
+                
+                Returns
+                -------
+                nanMask: array
+                        boolean array with the shape of df, True in missing values
+                """
+                nanMask = zeros(df.shape, dtype = bool)
+                for columnIndex, nanIndex in enumerate(nanIndexColumns):
+                        positions = df.index.get_indexer(nanIndex)
+                        if (positions == -1).any(): #-1 would mark the last row
+                                raise AttributeError("nanIndex_columns has indexes which are not in the dataframe (column " + str(df.columns[columnIndex]) + ")")
+                        nanMask[positions, columnIndex] = True
+                return nanMask
+
+        def floatDtype(self, dtype):
+                """
+                Checks the dtype used by the filling methods
+                
+                Parameters
+                ----------
+                dtype: numpy dtype or str
+                        float32 or float64
+                
+                Returns
+                -------
+                dtype: numpy dtype
+                        numpy dtype, None if it is not float32 or float64
+                """
+                try:
+                        dtype = numpyDtype(dtype)
+                except TypeError:
+                        return None
+                return dtype if dtype in (numpyDtype("float32"), numpyDtype("float64")) else None
+
+        def changeArrayNanMean(self, df, dtype=float64):
+                """
+                Copies the dataframe in an array changing missing values to mean values.
+                Only one full-size array is created, the means are computed in float64
+                
+                Parameters
+                ----------
+                df: pandas dataframe
+                        pandas dataframe with missing values
+                dtype: numpy dtype
+                        dtype of the array, for example float32 to halve the memory
+                
+                Returns
+                -------
+                values: array
+                        array changing missing values to their respective column mean values
+                """
+                values = df.to_numpy(dtype = dtype, copy = True)
+                rows, columns = nonzero(isnan(values))
+                if rows.size:
+                        values[rows, columns] = df.mean(axis = 0).to_numpy(dtype = float64)[columns]
+                return values
+
+
+class GapIndex:
+        """
+        Rows with missing values and blocks of rows without them,
+        built once before the iterations of the filling methods
+        
+        Parameters
+        ----------
+        nanMask: array
+                boolean array, True in missing values
+        blockSize: int
+                maximum number of rows of the blocks given by observedBlocks
+        
+        Attributes
+        ----------
+        rows: array
+                positions of the rows with missing values (sorted)
+        missing: int
+                number of missing values
+        """
+        def __init__(self, nanMask, blockSize=4096):
+                self.nanMask, self.blockSize = nanMask, blockSize
+                self.rows = flatnonzero(any(nanMask, axis = 1))
+                self.missing = int(nanMask.sum())
+
+        def observedBlocks(self):
+                """
+                Slices of consecutive rows without missing values, with at most blockSize rows
+                
+                Returns
+                -------
+                blocks: generator
+                        (start, stop) of each block
+                """
+                start = 0
+                for stop in self.rows.tolist() + [self.nanMask.shape[0]]:
+                        for blockStart in range(start, stop, self.blockSize):
+                                yield blockStart, min(blockStart + self.blockSize, stop)
+                        start = stop + 1
@@ -0,0 +1,214 @@
+"""
+Note: V 1.0.0 Originally, filling data methods was developed by Eric Alfaro and Javier Soley in SCILAB
+      Python version was developed by Rolando Duarte and Erick Rivera
+      Centro de Investigaciones Geofísicas (CIGEFI)
+      Universidad de Costa Rica (UCR)
+"""
+
+"""
+MIT License
+Copyright 2021 Rolando Jesus Duarte Mejias and Erick Rivera Fernandez
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software
+and associated documentation files (the "Software"), to deal in the Software without restriction,
+including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so,
+subject to the following conditions:
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR
+IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+from numpy import arange, diag, float64, outer, sqrt, zeros #Handling arrays
+from numpy.linalg import eigh, qr, svd #Decompositions
+#scipy and scikit-learn are imported when a solver uses them
+from FillingTimeSeries.Telemetry import FillingReport # Timing information
+
+
+class SVDEngine:
+    """
+    Truncated decomposition used in each iteration of the principal components method.
+    Between iterations only the missing values change, so the warm-started solvers reuse
+    the singular vectors of the previous iteration
+
+    Parameters
+    ----------
+    components: int
+        principal component number
+    solver: str
+        "arpack": new StandardScaler and PCA(svd_solver = "arpack") in each iteration.
+        "randomized": randomized decomposition.
+        "warm-arpack": ARPACK seeded with the leading right singular vector of the previous iteration.
+        "subspace": one subspace iteration started from the previous right singular vectors.
+        The block is oversampled, so it converges fast even if the singular values are close.
+        "gram": eigenvectors of the correlation matrix of the columns. The contribution of the rows without
+        missing values is computed once, so each iteration costs (rows with missing values) x columns^2
+    randomState: int
+        Seed used by the randomized solvers
+
+    The arrays keep their dtype (float32 inputs are decomposed in float32) and the scaling
+    is done in place. When a GapIndex is given, only the rows with missing values are reconstructed
+    """
+    solvers = ("arpack", "randomized", "warm-arpack", "subspace", "gram")
+    oversamples = 10 #Extra vectors kept by the subspace solver
+
+    def __init__(self, components, solver="arpack", randomState=0):
+        if solver not in self.solvers:
+            raise AttributeError("solver must be one of " + ", ".join(["'" + s + "'" for s in self.solvers]))
+        self.components, self.solver, self.randomState = components, solver, randomState
+        self.vectors = None #Right singular vectors of the previous iteration
+        self.block = None #Oversampled right singular vectors used by the subspace solver
+        self.observed = None #Shift, sums and Gram matrix of the rows without missing values used by the gram solver
+
+    def scale(self, values):
+        """
+        Standardizes the columns as StandardScaler does
+
+        Parameters
+        ----------
+        values: array
+            2-D array without missing values
+
+        Returns
+        -------
+        valuesS: array
+            standardized array
+        mean: array
+            mean of each column
+        std: array
+            standard deviation of each column (1 for constant columns)
+        """
+        mean, std = values.mean(axis = 0), values.std(axis = 0)
+        std[std == 0] = 1
+        valuesS = values - mean
+        valuesS /= std
+        return valuesS, mean, std
+
+    def reconstruct(self, values, report=None, gaps=None):
+        """
+        Reconstructs the array using the principal components
+
+        Parameters
+        ----------
+        values: array
+            2-D array without missing values
+        report: FillingReport
+            If it is given, the time of the scaling and svd stages is added to the key "all"
+        gaps: GapIndex
+            If it is given, only the rows with missing values are reconstructed. The gram solver
+            assumes that the other rows do not change between calls
+
+        Returns
+        -------
+        fit: array
+            array reconstructed with the principal components, in the original scale
+            (only the rows in gaps.rows if gaps is given)
+        """
+        report = FillingReport("SVDEngine") if report is None else report
+        rows = slice(None) if gaps is None else gaps.rows
+        if self.solver == "gram":
+            return self.gram(values, report, gaps)
+        elif self.solver == "arpack":
+            from sklearn.decomposition import PCA #Applies principal components transformations
+            from sklearn.preprocessing import StandardScaler #Normalizes data
+            with report.timer("all", "scaling"):
+                scale = StandardScaler()
+                valuesS = scale.fit_transform(values)
+            with report.timer("all", "svd"):
+                pca = PCA(n_components = self.components, copy = False, svd_solver = "arpack", random_state = 0) #valuesS is not used again
+                fitS = pca.inverse_transform(pca.fit_transform(valuesS)[rows])
+            with report.timer("all", "scaling"):
+                return scale.inverse_transform(fitS)
+
+        with report.timer("all", "scaling"):
+            valuesS, mean, std = self.scale(values)
+        with report.timer("all", "svd"):
+            if self.solver == "randomized":
+                from sklearn.utils.extmath import randomized_svd #Randomized decomposition
+                U, s, Vt = randomized_svd(valuesS, self.components, random_state = self.randomState)
+            elif self.solver == "warm-arpack":
+                v0 = None if self.vectors is None else self.vectors[:, 0]
+                if valuesS.shape[0] < valuesS.shape[1] and v0 is not None:
+                    v0 = valuesS @ v0 #ARPACK works over the smaller dimension
+                from scipy.sparse.linalg import svds #Truncated decomposition
+                U, s, Vt = svds(valuesS, k = self.components, v0 = v0, random_state = self.randomState)
+                U, s, Vt = U[:, ::-1], s[::-1], Vt[::-1] #svds sorts the singular values in ascending order
+            else:
+                U, s, Vt = self.subspace(valuesS)
+            self.vectors = Vt.T
+            fitS = (U[rows] * s) @ Vt
+        with report.timer("all", "scaling"):
+            fitS *= std
+            fitS += mean
+            return fitS
+
+    def gram(self, values, report, gaps=None):
+        """
+        Reconstructs the rows with missing values using the eigenvectors of the correlation matrix.
+        The sums and the Gram matrix of the rows without missing values are computed once by blocks of rows,
+        so each call only uses the rows with missing values
+
+        Parameters
+        ----------
+        values: array
+            2-D array without missing values
+        report: FillingReport
+            The time of the scaling and svd stages is added to the key "all"
+        gaps: GapIndex
+            rows with missing values. None uses every row in each call
+
+        Returns
+        -------
+        fit: array
+            rows with missing values reconstructed with the principal components, in the original scale
+        """
+        rowsNumber, columnsNumber = values.shape
+        with report.timer("all", "scaling"):
+            if self.observed is None:
+                #Values are shifted by the first column means, so the Gram matrix has no cancellation errors
+                shift, sums, gram = values.mean(axis = 0, dtype = float64), zeros(columnsNumber), zeros((columnsNumber, columnsNumber))
+                for start, stop in ([] if gaps is None else gaps.observedBlocks()):
+                    block = values[start:stop] - shift
+                    sums += block.sum(axis = 0)
+                    gram += block.T @ block
+                self.observed = (shift, sums, gram)
+            shift, sums, gram = self.observed
+            changing = values[arange(rowsNumber) if gaps is None else gaps.rows] - shift
+            mean = (sums + changing.sum(axis = 0)) / rowsNumber
+            covariance = (gram + changing.T @ changing) / rowsNumber - outer(mean, mean)
+            std = sqrt(diag(covariance).clip(min = 0))
+            std[std == 0] = 1
+        with report.timer("all", "svd"):
+            _, eigenvectors = eigh(covariance / outer(std, std))
+            self.vectors = eigenvectors[:, ::-1][:, :self.components]
+            fitS = ((changing - mean) / std) @ self.vectors @ self.vectors.T
+        with report.timer("all", "scaling"):
+            fitS *= std
+            fitS += mean + shift
+            return fitS.astype(values.dtype, copy = False)
+
+    def subspace(self, valuesS):
+        """
+        Subspace iteration started from the previous (oversampled) right singular vectors
+
+        Parameters
+        ----------
+        valuesS: array
+            standardized array
+
+        Returns
+        -------
+        U, s, Vt: array
+            truncated decomposition of valuesS
+        """
+        from sklearn.utils.extmath import randomized_svd #Randomized decomposition
+        k = self.components
+        if self.block is None:
+            U, s, Vt = randomized_svd(valuesS, min(k + self.oversamples, min(valuesS.shape)), random_state = self.randomState)
+            self.block = Vt.T
+        else:
+            Q, _ = qr(valuesS @ self.block)
+            Ub, s, Vt = svd(Q.T @ valuesS, full_matrices = False)
+            U, self.block = Q @ Ub, Vt.T
+        return U[:, :k], s[:k], Vt[:k]
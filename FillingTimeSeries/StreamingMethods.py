@@ -0,0 +1,200 @@
+"""
+Note: V 1.0.0 Originally, filling data methods was developed by Eric Alfaro and Javier Soley in SCILAB
+      Python version was developed by Rolando Duarte and Erick Rivera
+      Centro de Investigaciones Geofísicas (CIGEFI)
+      Universidad de Costa Rica (UCR)
+"""
+
+"""
+MIT License
+Copyright 2021 Rolando Jesus Duarte Mejias and Erick Rivera Fernandez
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software
+and associated documentation files (the "Software"), to deal in the Software without restriction,
+including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so,
+subject to the following conditions:
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR
+IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+from numpy import abs, all, column_stack, isnan, sqrt, vstack #Handling arrays
+from numpy.linalg import svd #Decompositions
+from pandas import DataFrame, RangeIndex, concat #Handles datasets
+from FillingTimeSeries.AutoregressionEngine import AutoregressionEngine # Numpy engine for autoregression
+from FillingTimeSeries.FillingMethods import ComponentsAutoregression # Full method
+from FillingTimeSeries.PreprocessingFillingMethods import Preprocessing # Created module for data processing purporses
+from FillingTimeSeries.SVDEngine import SVDEngine # Decompositions for principal components method
+
+
+class IncrementalFilling:
+    """
+    Stateful version of the full method for series that grow with new observations.
+    fit applies ComponentsAutoregression.FullMethod over the history and keeps the autoregression
+    coefficients, the scaling and the principal components basis. append fills only the new rows
+    with them: a forward autoregression from the last filled rows and then the principal components
+    iteration with the fixed basis. When the new observed values are not well reconstructed by the
+    basis (drift), the full method is applied again over the whole history
+
+    Parameters
+    ----------
+    lags: int
+        Lags value for autoregression
+    components: int
+        principal component number
+    tol: float
+        Tolerance value of difference between previous filled dataframe and current filled dataframe
+    itermax: int
+        Maximum iterations to find a filled dataframe that complies tolerance condition
+    valueMin: float
+        The minimum value allowed after applying the methods.
+    solver: str
+        Decomposition used by the principal components method when the history is fitted
+    driftThreshold: float
+        Ratio between the reconstruction error of the new observed values and the reconstruction
+        error of the history that triggers a full refit
+    """
+    def __init__(self, lags=1, components=1, tol=1e-3, itermax=1000, valueMin=0.0, solver="arpack", driftThreshold=2.0):
+        if lags <= 0:
+            raise AttributeError("lags must be 'int' greater than 0")
+        elif components <= 0:
+            raise AttributeError("components must be 'int' greater than 0")
+        elif tol < 0:
+            raise AttributeError("tol must be 'float' equal or greater than 0")
+        elif itermax <= 0:
+            raise AttributeError("itermax must be 'int' greater than 0")
+        elif driftThreshold <= 0:
+            raise AttributeError("driftThreshold must be 'float' greater than 0")
+        else:
+            self.lags, self.components, self.tol, self.itermax = lags, components, tol, itermax
+            self.valueMin, self.solver, self.driftThreshold = valueMin, solver, driftThreshold
+            self.preprocessing, self.engine = Preprocessing(), AutoregressionEngine()
+            self.rawChunks, self.filledChunks = [], []
+            self.refits, self.drift = 0, 0.0
+
+    def fit(self, df):
+        """
+        Fills the history with the full method and keeps the fitted models
+
+        Parameters
+        ----------
+        df: pandas dataframe, 2-D numpy array (or memmap) or path to a .npy file
+            History with missing values
+
+        Returns
+        -------
+        dfFilled: pandas dataframe
+            filled history (with the index of df)
+        """
+        raw = self.preprocessing.loadData(df)
+        if raw is None:
+            raise AttributeError("df must be a pandas dataframe, a 2-D numpy array or a path to a .npy file")
+        raw.columns = raw.columns.astype(str)
+        #The methods find the missing values by index, so a repeated index (appended chunks) is filled by positions
+        full = ComponentsAutoregression(raw if raw.index.is_unique else raw.reset_index(drop = True))
+        dfFilled = full.FullMethod(lags = self.lags, components = self.components, tol = self.tol, itermax = self.itermax,
+                                   valueMin = self.valueMin, solver = self.solver)
+        dfFilled.index = raw.index
+        self.columns, self.report = raw.columns, full.report
+        self.rawChunks, self.filledChunks = [raw], [dfFilled]
+
+        values = dfFilled.to_numpy(dtype = float)
+        self.params = column_stack([self.engine.fit(values[:, column], self.lags) for column in range(values.shape[1])])
+        valuesS, self.mean, self.std = SVDEngine(self.components).scale(values)
+        _, _, Vt = svd(valuesS, full_matrices = False)
+        self.basis = Vt[: self.components].T
+        self.residual = self.reconstructionError(values, ~isnan(raw.to_numpy(dtype = float)))
+        self.tail = values[-self.lags :].copy() #Last filled rows used by the autoregression
+        self.refits += 1
+        return dfFilled
+
+    def reconstructionError(self, values, observed):
+        """
+        Root mean square error of the principal components reconstruction over the observed values (scaled)
+        """
+        if not observed.any():
+            return 0.0
+        valuesS = (values - self.mean) / self.std
+        errorS = valuesS - (valuesS @ self.basis) @ self.basis.T
+        return float(sqrt((errorS[observed] ** 2).mean()))
+
+    def append(self, newRows):
+        """
+        Fills new rows appended at the end of the history
+
+        Parameters
+        ----------
+        newRows: pandas dataframe or 2-D numpy array
+            New observations with the same columns of the history
+
+        Returns
+        -------
+        dfNew: pandas dataframe
+            filled new rows (with the index of newRows, the rows of an array continue a range index)
+        """
+        if not self.filledChunks:
+            raise AttributeError("fit must be applied before append")
+        new = self.preprocessing.loadData(newRows)
+        if new is None:
+            raise AttributeError("newRows must be a pandas dataframe or a 2-D numpy array")
+        if isinstance(newRows, DataFrame):
+            new.columns = new.columns.astype(str)
+            if list(new.columns) != list(self.columns):
+                raise AttributeError("newRows must have the columns of the history")
+        elif new.shape[1] != len(self.columns):
+            raise AttributeError("newRows must have " + str(len(self.columns)) + " columns")
+        else:
+            rowsNumber = sum(len(chunk) for chunk in self.rawChunks)
+            new.index = RangeIndex(rowsNumber, rowsNumber + len(new)) #The history index is not repeated
+        new.columns = self.columns
+        values = new.to_numpy(dtype = float, copy = True)
+        missing = isnan(values)
+
+        #Forward autoregression, each row uses the previous filled rows
+        buffer = vstack([self.tail, values])
+        for row in range(self.lags, len(buffer)):
+            gaps = isnan(buffer[row])
+            if gaps.any():
+                pred = (self.params * buffer[row - self.lags : row][::-1]).sum(axis = 0)
+                buffer[row, gaps] = pred[gaps]
+        values = buffer[self.lags :]
+
+        #Principal components with the fitted basis
+        for iters in range(1, self.itermax + 1):
+            valuesS = (values - self.mean) / self.std
+            fit = (valuesS @ self.basis) @ self.basis.T * self.std + self.mean
+            difference = abs(fit[missing] - values[missing])
+            values[missing] = fit[missing]
+            if all(difference <= self.tol):
+                break
+        values[values < self.valueMin] = self.valueMin
+
+        self.rawChunks.append(new)
+        self.drift = self.reconstructionError(values, ~missing) / max(self.residual, 1e-12)
+        if self.drift > self.driftThreshold:
+            dfFilled = self.refit()
+            return dfFilled.iloc[-len(new) :].copy()
+        dfNew = DataFrame(values, index = new.index, columns = self.columns)
+        self.filledChunks.append(dfNew)
+        self.tail = vstack([self.tail, values])[-self.lags :]
+        return dfNew
+
+    def refit(self):
+        """
+        Applies the full method again over the whole history
+
+        Returns
+        -------
+        dfFilled: pandas dataframe
+            filled history
+        """
+        return self.fit(concat(self.rawChunks))
+
+    @property
+    def filled(self):
+        """
+        Filled history, including the appended rows, with the index of each chunk
+        """
+        return concat(self.filledChunks)
@@ -0,0 +1,216 @@
+"""
+Note: V 1.0.0 Originally, filling data methods was developed by Eric Alfaro and Javier Soley in SCILAB
+      Python version was developed by Rolando Duarte and Erick Rivera
+      Centro de Investigaciones Geofísicas (CIGEFI)
+      Universidad de Costa Rica (UCR)
+"""
+
+"""
+MIT License
+Copyright 2021 Rolando Jesus Duarte Mejias and Erick Rivera Fernandez
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software
+and associated documentation files (the "Software"), to deal in the Software without restriction,
+including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so,
+subject to the following conditions:
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR
+IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+from contextlib import contextmanager
+from time import perf_counter, time
+from pandas import DataFrame, concat #Handles datasets
+
+
+class FillingReport:
+    """
+    Convergence and timing information of an iterative filling method.
+    Each key is a column for the autoregression method and "all" for the principal components method
+
+    Parameters
+    ----------
+    method: str
+        Name of the filling method
+    callback: callable
+        Called after each iteration with a dictionary: method, key, iteration, residual and seconds
+        (time since the report was created)
+
+    Attributes
+    ----------
+    iterations: dict
+        iterations used by each key
+    residuals: dict
+        maximum change between consecutive iterations, one value per iteration
+    timings: dict
+        seconds spent by each key in each stage (fit, predict, scaling, svd, writeback)
+    itermaxReached: dict
+        True if the key stopped before converging (itermax, time budget or stagnation)
+    stopReasons: dict
+        why each key stopped: "converged", "itermax", "timeBudget" or "stagnation" (see StopControl)
+    children: dict
+        reports of the methods used inside this method (FullMethod)
+    """
+    def __init__(self, method, callback=None):
+        self.method, self.callback = method, callback
+        self.iterations, self.residuals, self.timings, self.itermaxReached = {}, {}, {}, {}
+        self.stopReasons = {}
+        self.children = {}
+        self.begin = perf_counter()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["callback"] = None #Callbacks are not sent back from the workers
+        return state
+
+    @contextmanager
+    def timer(self, key, stage):
+        """
+        Adds the time spent inside the with block to the stage of the key
+        """
+        begin = perf_counter()
+        try:
+            yield
+        finally:
+            stages = self.timings.setdefault(key, {})
+            stages[stage] = stages.get(stage, 0.0) + perf_counter() - begin
+
+    def record(self, key, iteration, residual):
+        """
+        Saves the residual of one iteration and calls the callback
+        """
+        self.residuals.setdefault(key, []).append(float(residual))
+        self.iterations[key] = iteration
+        if self.callback is not None:
+            self.callback({"method": self.method, "key": key, "iteration": iteration,
+                           "residual": float(residual), "seconds": perf_counter() - self.begin})
+
+    def finish(self, key, converged, reason=None):
+        """
+        Saves how the key stopped. reason is "converged" or "itermax" if it is not given
+        """
+        self.itermaxReached[key] = not converged
+        self.stopReasons[key] = reason if reason is not None else ("converged" if converged else "itermax")
+
+    def merge(self, other):
+        """
+        Adds the information of a report made by a worker. The callback is called
+        with the iterations of the other report
+
+        Parameters
+        ----------
+        other: FillingReport
+            report of some keys of the same method
+        """
+        for key, residuals in other.residuals.items():
+            for iteration, residual in enumerate(residuals, start = 1):
+                self.record(key, iteration, residual)
+        self.iterations.update(other.iterations)
+        self.timings.update(other.timings)
+        self.itermaxReached.update(other.itermaxReached)
+        self.stopReasons.update(other.stopReasons)
+
+    @property
+    def converged(self):
+        """
+        True if every key converged before itermax
+        """
+        return not any(self.itermaxReached.values()) and all(child.converged for child in self.children.values())
+
+    @property
+    def stopReason(self):
+        """
+        "converged" if every key converged, otherwise the reason of the first key which did not converge
+        """
+        for reason in list(self.stopReasons.values()) + [child.stopReason for child in self.children.values()]:
+            if reason != "converged":
+                return reason
+        return "converged"
+
+    def summary(self):
+        """
+        Summary of the report, one row per key
+
+        Returns
+        -------
+        summary: pandas dataframe
+            method, iterations, last residual, itermaxReached and seconds of each stage
+        """
+        rows = []
+        for key in self.iterations:
+            row = {"method": self.method, "key": key, "iterations": self.iterations[key],
+                   "residual": self.residuals[key][-1] if self.residuals.get(key) else None,
+                   "itermaxReached": self.itermaxReached.get(key), "stopReason": self.stopReasons.get(key)}
+            row.update(self.timings.get(key, {}))
+            rows.append(row)
+        summary = DataFrame(rows)
+        if self.children:
+            summary = concat([child.summary() for child in self.children.values()] + [summary], ignore_index = True)
+        return summary
+
+
+class StopControl:
+    """
+    Stop rules shared by the iterative methods. An iteration stops the key when its residual is lower
+    than or equal to tol ("converged"), when it is the iteration itermax ("itermax"), when the time budget
+    is over ("timeBudget") or when the residual has not improved its minimum in patience iterations ("stagnation")
+
+    Parameters
+    ----------
+    tol: float
+        Tolerance of the residual
+    itermax: int
+        Maximum iterations
+    deadline: float
+        Wall-clock time (time.time()) when the time budget ends, so workers of other processes can share it.
+        None has no time limit
+    patience: int
+        Iterations without a new minimum residual before stopping. None never stops by stagnation
+    """
+    reasons = ("converged", "itermax", "timeBudget", "stagnation")
+
+    def __init__(self, tol, itermax, deadline=None, patience=None):
+        self.tol, self.itermax, self.deadline, self.patience = tol, itermax, deadline, patience
+        self.best = {} #Minimum residual of each key and its iteration
+
+    @classmethod
+    def fromBudget(cls, tol, itermax, timeBudget=None, patience=None):
+        """
+        Builds the stop rules starting the time budget (seconds) now
+        """
+        return cls(tol, itermax, deadline = None if timeBudget is None else time() + timeBudget, patience = patience)
+
+    def remaining(self):
+        """
+        Seconds left of the time budget, None if there is no time limit
+        """
+        return None if self.deadline is None else max(self.deadline - time(), 0.0)
+
+    def check(self, key, iteration, residual):
+        """
+        Applies the stop rules after one iteration
+
+        Returns
+        -------
+        reason: str
+            why the key stops, None if it continues
+        """
+        if residual <= self.tol:
+            return "converged"
+        if key not in self.best or residual < self.best[key][0]:
+            self.best[key] = (residual, iteration)
+        if iteration >= self.itermax:
+            return "itermax"
+        elif self.deadline is not None and time() >= self.deadline:
+            return "timeBudget"
+        elif self.patience is not None and iteration - self.best[key][1] >= self.patience:
+            return "stagnation"
+        return None
+
+    def improved(self, key, iteration):
+        """
+        True if the residual of this iteration is the minimum of the key
+        """
+        return self.best.get(key, (None, None))[1] == iteration
@@ -0,0 +1,186 @@
+"""
+Note: V 1.0.0 Originally, filling data methods was developed by Eric Alfaro and Javier Soley in SCILAB
+      Python version was developed by Rolando Duarte and Erick Rivera
+      Centro de Investigaciones Geofísicas (CIGEFI)
+      Universidad de Costa Rica (UCR)
+"""
+
+"""
+MIT License
+Copyright 2021 Rolando Jesus Duarte Mejias and Erick Rivera Fernandez
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software
+and associated documentation files (the "Software"), to deal in the Software without restriction,
+including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense,
+and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so,
+subject to the following conditions:
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR
+IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor #Parallel settings
+from os import cpu_count
+from time import perf_counter
+from numpy import abs, isnan, nan, sqrt #Handling arrays
+from numpy.random import default_rng #Reproducible random numbers
+from pandas import DataFrame, isna #Handles datasets
+from FillingTimeSeries.FillingMethods import Autoregression, PrincipalComponentAnalysis
+from FillingTimeSeries.PreprocessingFillingMethods import Preprocessing # Created module for data processing purporses
+
+
+class ParameterSweep:
+    """
+    Chooses lags and components by hiding a fraction of the observed values and measuring
+    the error of the filled values over them.
+    The autoregression is applied once for each lags value and its result is used by every components value,
+    so the grid costs len(lags) autoregressions and len(lags) * len(components) principal components iterations
+
+    Parameters
+    ----------
+    df: pandas dataframe, 2-D numpy array (or memmap) or path to a .npy file
+        Dataframe with missing values
+    holdout: float
+        Fraction of the observed values hidden to measure the error
+    seed: int
+        Seed used to choose the hidden values
+    """
+    def __init__(self, df, holdout=0.1, seed=0):
+        self.preprocessing = Preprocessing()
+        self.df = self.preprocessing.loadData(df)
+        if self.df is None:
+            raise AttributeError("df must be a pandas dataframe, a 2-D numpy array or a path to a .npy file")
+        elif not 0 < holdout < 1:
+            raise AttributeError("holdout must be 'float' between 0 and 1")
+        self.df.columns = self.df.columns.astype(str) #Avoiding numpy errors
+        self.df = self.df.reset_index(drop = True) #Methods work with positions
+        values = self.df.to_numpy(dtype = float, copy = True)
+        self.truth = values.copy()
+        self.holdoutMask = ~isnan(values) & (default_rng(seed).random(values.shape) < holdout)
+        values[self.holdoutMask] = nan
+        self.dfMasked = DataFrame(values, columns = self.df.columns)
+        #Shared by every setting: mean values and missing value indexes of the masked dataframe
+        self.dfMean, self.nanIndex_columns = self.preprocessing.changeDfNanMean(self.dfMasked)
+
+    def error(self, dfFilled):
+        """
+        Error over the hidden values
+
+        Returns
+        -------
+        rmse, mae: float
+            root mean square error and mean absolute error
+        """
+        error = dfFilled.to_numpy(dtype = float)[self.holdoutMask] - self.truth[self.holdoutMask]
+        return float(sqrt((error**2).mean())), float(abs(error).mean())
+
+    def run(self, lags=(1, 2, 3), components=(1, 2, 3), tol=1e-3, itermax=1000, valueMin=0.0, solver="arpack",
+            n_jobs=1, executor="process"):
+        """
+        Applies every (lags, components) setting to the masked dataframe
+
+        Parameters
+        ----------
+        lags: list
+            lags values. None in the list applies only the principal components method (over the mean values),
+            lags=None is the same as lags=(None,)
+        components: list
+            principal component numbers. None in the list applies only the autoregression method,
+            components=None is the same as components=(None,)
+        tol, itermax, valueMin, solver:
+            Parameters of ComponentsAutoregression.FullMethod
+        n_jobs: int
+            Number of workers. -1 uses all the processors
+        executor: str
+            "process" or "thread" pool used when n_jobs is not 1
+
+        Returns
+        -------
+        dfResults: pandas dataframe
+            lags, components, rmse, mae, seconds of the autoregression ("arSeconds"), seconds of the
+            principal components method ("pcaSeconds") and total seconds of each setting, sorted by rmse
+        """
+        if n_jobs == 0 or n_jobs < -1:
+            raise AttributeError("n_jobs must be 'int' greater than 0 or -1")
+        elif executor not in ("process", "thread"):
+            raise AttributeError("executor must be 'process' or 'thread'")
+        n_jobs = cpu_count() if n_jobs == -1 else n_jobs
+        lags = (None,) if lags is None else tuple(lags)
+        components = (None,) if components is None else tuple(components)
+        if all(k is None for k in lags) and all(c is None for c in components):
+            raise AttributeError("lags or components must have a value which is not None")
+        arParams = {"tol": tol, "itermax": itermax, "valueMin": valueMin}
+        pcaParams = {"tol": tol, "itermax": itermax, "valueMin": valueMin, "solver": solver}
+        Executor = ProcessPoolExecutor if executor == "process" else ThreadPoolExecutor
+        pool = Executor(max_workers = n_jobs) if n_jobs > 1 else None
+        mapping = map if pool is None else pool.map
+        try:
+            #First stage: one autoregression for each lags value
+            arTasks = [(self.dfMasked, k, arParams) for k in lags if k is not None]
+            arResults = {k: (dfAR, seconds) for k, dfAR, seconds in mapping(_sweepAR, arTasks)}
+            if None in lags:
+                arResults[None] = (self.dfMean, 0.0)
+
+            #Second stage: principal components over each autoregression
+            pcaTasks = [(k, arResults[k][0], self.nanIndex_columns, c, pcaParams) for k in lags for c in components if c is not None]
+            pcaResults = list(mapping(_sweepPCA, pcaTasks))
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        rows = []
+        for k in lags:
+            if k is not None and None in components:
+                dfAR, arSeconds = arResults[k]
+                rmse, mae = self.error(dfAR)
+                rows.append({"lags": k, "components": None, "rmse": rmse, "mae": mae, "arSeconds": arSeconds, "pcaSeconds": 0.0})
+        for k, c, dfPCA, pcaSeconds in pcaResults:
+            rmse, mae = self.error(dfPCA)
+            rows.append({"lags": k, "components": c, "rmse": rmse, "mae": mae, "arSeconds": arResults[k][1], "pcaSeconds": pcaSeconds})
+        dfResults = DataFrame(rows, columns = ["lags", "components", "rmse", "mae", "arSeconds", "pcaSeconds"])
+        dfResults = dfResults.astype({"lags": "Int64", "components": "Int64"}) #None is kept as missing value
+        dfResults["seconds"] = dfResults["arSeconds"] + dfResults["pcaSeconds"]
+        self.results = dfResults.sort_values("rmse").reset_index(drop = True)
+        return self.results
+
+    @property
+    def best(self):
+        """
+        Setting with the lowest rmse
+
+        Returns
+        -------
+        best: dict
+            lags and components of the best setting (None if the stage is not applied)
+        """
+        best = self.results.iloc[0]
+        return {key: None if isna(best[key]) else int(best[key]) for key in ("lags", "components")}
+
+
+def _sweepAR(task):
+    """
+    Applies the autoregression of one lags value
+
+    Returns
+    -------
+    lags, dfAR, seconds
+    """
+    dfMasked, lags, params = task
+    begin = perf_counter()
+    dfAR = Autoregression(dfMasked).ULCLMethod(lags = lags, **params)
+    return lags, dfAR, perf_counter() - begin
+
+
+def _sweepPCA(task):
+    """
+    Applies the principal components method of one setting over a filled dataframe
+
+    Returns
+    -------
+    lags, components, dfPCA, seconds
+    """
+    lags, dfInput, nanIndexColumns, components, params = task
+    begin = perf_counter()
+    dfPCA = PrincipalComponentAnalysis(dfInput, nanIndex_columns = nanIndexColumns).PCAMethod(components = components, **params)
+    return lags, components, dfPCA, perf_counter() - begin
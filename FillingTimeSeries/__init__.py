@@ -21,5 +21,11 @@ IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 """
 
 from FillingTimeSeries.FillingMethods import PrincipalComponentAnalysis, Autoregression, ComponentsAutoregression
+from FillingTimeSeries.Telemetry import FillingReport
+from FillingTimeSeries.StreamingMethods import IncrementalFilling
+from FillingTimeSeries.BatchMethods import BatchFilling, BatchResult
+from FillingTimeSeries.Caching import FillingCache
+from FillingTimeSeries.Tuning import ParameterSweep
+from FillingTimeSeries.CommandLine import FileFilling
 #These classes will be available to the user
 __version__ = "1.0.0"
\ No newline at end of file
@@ -0,0 +1,9 @@
+"""
+Command line of the package: python -m FillingTimeSeries --help (same as filling-time-series --help)
+"""
+
+from sys import exit
+from FillingTimeSeries.CommandLine import main
+
+if __name__ == "__main__":
+    exit(main())
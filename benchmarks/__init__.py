@@ -0,0 +1,13 @@
+"""
+Benchmarks for the filling methods over synthetic series with controlled gap patterns.
+
+Usage
+-----
+python -m benchmarks --output benchmark.json
+python -m benchmarks --compare old.json new.json
+python -m benchmarks --import-only
+python -m benchmarks --check-engines
+"""
+
+from benchmarks.synthetic import SyntheticData
+from benchmarks.runner import BenchmarkRunner
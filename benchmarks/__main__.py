@@ -0,0 +1,59 @@
+"""
+Command line of the benchmarks: python -m benchmarks --help
+"""
+
+from argparse import ArgumentParser
+from sys import exit
+from benchmarks.runner import BenchmarkRunner
+from benchmarks.synthetic import SyntheticData
+
+
+def main(argv=None):
+    parser = ArgumentParser(prog = "python -m benchmarks", description = "Benchmarks of the filling methods over synthetic series")
+    parser.add_argument("--methods", nargs = "+", default = list(BenchmarkRunner.methods), choices = BenchmarkRunner.methods)
+    parser.add_argument("--rows", nargs = "+", type = int, default = [1000, 5000])
+    parser.add_argument("--columns", nargs = "+", type = int, default = [5, 20])
+    parser.add_argument("--fractions", nargs = "+", type = float, default = [0.05, 0.2])
+    parser.add_argument("--patterns", nargs = "+", default = list(SyntheticData.patterns), choices = SyntheticData.patterns)
+    parser.add_argument("--lags", nargs = "+", type = int, default = [1, 3])
+    parser.add_argument("--components", nargs = "+", type = int, default = [1, 3])
+    parser.add_argument("--tol", type = float, default = None, help = "tol of the methods (default: method default)")
+    parser.add_argument("--itermax", type = int, default = None, help = "itermax of the methods (default: method default)")
+    parser.add_argument("--repeat", type = int, default = 1, help = "timed runs of each case, the best is reported")
+    parser.add_argument("--seed", type = int, default = 0)
+    parser.add_argument("--output", default = "benchmark.json", help = "JSON file with the results")
+    parser.add_argument("--compare", nargs = 2, metavar = ("OLD", "NEW"), help = "compares two result files and exits")
+    parser.add_argument("--threshold", type = float, default = 0.1, help = "relative slowdown reported as regression")
+    parser.add_argument("--import-only", action = "store_true", help = "only measures the cold import of the package")
+    parser.add_argument("--check-engines", action = "store_true",
+                        help = "only compares the numpy and statsmodels autoregression engines")
+    args = parser.parse_args(argv)
+
+    runner = BenchmarkRunner(repeat = args.repeat, seed = args.seed)
+    if args.compare:
+        regressions = runner.compare(args.compare[0], args.compare[1], threshold = args.threshold)
+        print(str(len(regressions)) + " regression(s)")
+        return 1 if regressions else 0
+
+    if args.import_only:
+        importResult = runner.importTime()
+        print("import FillingTimeSeries: {seconds:.3f} s, heavy modules loaded: {heavyModules}".format(**importResult))
+        return 1 if importResult["heavyModules"] else 0
+
+    if args.check_engines:
+        results = runner.engineAgreement(lags = args.lags)
+        for result in results:
+            print("{stage} lags={lags}: largest relative difference {difference:.2e} ({status})".format(
+                  status = "ok" if result["ok"] else "FAILED", **result))
+        return 0 if all(result["ok"] for result in results) else 1
+
+    params = {key: value for key, value in (("tol", args.tol), ("itermax", args.itermax)) if value is not None}
+    cases = runner.cases(args.methods, args.rows, args.columns, args.fractions, args.patterns, args.lags, args.components)
+    report = runner.run(cases, params)
+    runner.save(report, args.output)
+    print("Results written to " + args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,257 @@
+"""
+Runs the filling methods over a grid of synthetic cases and writes the results as JSON
+"""
+
+from itertools import product
+from json import dump, load, loads
+from platform import platform, python_version
+from subprocess import check_output
+from sys import executable
+from time import perf_counter
+from tracemalloc import get_traced_memory, start, stop
+from numpy import abs, flatnonzero, isnan, sqrt #Handling arrays
+import FillingTimeSeries
+from FillingTimeSeries import Autoregression, ComponentsAutoregression, PrincipalComponentAnalysis
+from benchmarks.synthetic import SyntheticData
+
+
+class BenchmarkRunner:
+    """
+    Measures wall time, peak memory, iterations and imputation error of the filling methods
+
+    Parameters
+    ----------
+    repeat: int
+        Number of timed runs of each case, the best time is reported
+    seed: int
+        Seed of the synthetic data
+    """
+    methods = ("ULCLMethod", "PCAMethod", "FullMethod")
+    heavyModules = ("matplotlib", "sklearn", "statsmodels", "scipy") #They must not be loaded by "import FillingTimeSeries"
+
+    def __init__(self, repeat=1, seed=0):
+        self.repeat, self.seed = repeat, seed
+
+    def importTime(self, repeat=5):
+        """
+        Measures a cold "import FillingTimeSeries" in new interpreters
+
+        Parameters
+        ----------
+        repeat: int
+            Number of interpreters, the best time is reported
+
+        Returns
+        -------
+        result: dict
+            import time (s) and heavy modules loaded by the import
+        """
+        code = ("import sys, time, json; t = time.perf_counter(); import FillingTimeSeries; t = time.perf_counter() - t; "
+                "print(json.dumps([t, [m for m in " + repr(self.heavyModules) + " if m in sys.modules]]))")
+        results = [loads(check_output([executable, "-c", code])) for _ in range(repeat)]
+        return {"seconds": min(seconds for seconds, _ in results), "heavyModules": results[0][1]}
+
+    def engineAgreement(self, lags=(1, 2, 3), rows=1000, columns=5, fraction=0.1, rtol=1e-8):
+        """
+        Compares the numpy and statsmodels engines of Autoregression.simpleAR over synthetic series,
+        predicting the first and the last positions which have lags previous values, and of ULCLMethod
+        with gaps in the first and the last lags positions (only one direction of the autoregression is used)
+
+        Parameters
+        ----------
+        lags: list
+            lags values compared
+        rows, columns, fraction:
+            size and fraction of missing values of the synthetic series
+        rtol: float
+            largest difference allowed, relative to the largest absolute value
+
+        Returns
+        -------
+        results: list
+            stage, lags, largest relative difference and True if it is lower than or equal to rtol,
+            for each stage and lags value
+        """
+        data = SyntheticData(rows = rows, columns = columns, seed = self.seed)
+        df = data.gaps(data.series(), pattern = "random", fraction = fraction)
+        serie = df.iloc[:, 0]
+        results = []
+        for k in lags:
+            nanIndex = sorted(set(flatnonzero(isnan(serie.to_numpy())).tolist()) | {k, rows - 1})
+            nanIndex = [index for index in nanIndex if index >= k] #Both engines need lags previous values
+            filled = {engine: Autoregression(df).simpleAR(serie.fillna(serie.mean()), nanIndex, k, engine = engine).to_numpy()
+                      for engine in ("numpy", "statsmodels")}
+            results.append(self.agreement("simpleAR", k, filled, rtol))
+            dfGaps = df.copy()
+            dfGaps.iloc[:k, 0] = float("nan") #Only the backward prediction is used
+            dfGaps.iloc[-k:, 1 % columns] = float("nan") #Only the forward prediction is used
+            filled = {engine: Autoregression(dfGaps).ULCLMethod(lags = k, tol = 1e-3, itermax = 10, engine = engine).to_numpy()
+                      for engine in ("numpy", "statsmodels")}
+            results.append(self.agreement("ULCLMethod", k, filled, rtol))
+        return results
+
+    def agreement(self, stage, lags, filled, rtol):
+        """
+        Largest difference between the numpy and statsmodels results, relative to the largest absolute value
+
+        Returns
+        -------
+        result: dict
+            stage, lags, difference and True if it is lower than or equal to rtol
+        """
+        difference = float(abs(filled["numpy"] - filled["statsmodels"]).max() / abs(filled["statsmodels"]).max())
+        return {"stage": stage, "lags": lags, "difference": difference, "ok": difference <= rtol}
+
+    def cases(self, methods, rows, columns, fractions, patterns, lags, components):
+        """
+        Builds the grid of cases. Each method only varies the parameters it uses
+
+        Returns
+        -------
+        cases: list
+            list of dictionaries with the parameters of each case
+        """
+        cases = []
+        for method, nRows, nColumns, fraction, pattern in product(methods, rows, columns, fractions, patterns):
+            case = {"method": method, "rows": nRows, "columns": nColumns, "fraction": fraction, "pattern": pattern}
+            lagsGrid = lags if method != "PCAMethod" else [None]
+            componentsGrid = [c for c in components if c < nColumns] if method != "ULCLMethod" else [None]
+            for nLags, nComponents in product(lagsGrid, componentsGrid):
+                cases.append(dict(case, lags = nLags, components = nComponents))
+        return cases
+
+    def fill(self, case, df, params):
+        """
+        Applies the method of the case
+
+        Returns
+        -------
+        dfFilled: pandas dataframe
+            filled dataframe
+        iterations: int or dict
+            iterations used by the method
+        converged: bool
+            False if the method reached itermax
+        """
+        if case["method"] == "ULCLMethod":
+            filler = Autoregression(df)
+            dfFilled = filler.ULCLMethod(lags = case["lags"], **params)
+        elif case["method"] == "PCAMethod":
+            filler = PrincipalComponentAnalysis(df)
+            dfFilled = filler.PCAMethod(components = case["components"], **params)
+        else:
+            filler = ComponentsAutoregression(df)
+            dfFilled = filler.FullMethod(lags = case["lags"], components = case["components"], **params)
+        return dfFilled, filler.iterations, filler.report.converged
+
+    def runCase(self, case, params):
+        """
+        Runs one case
+
+        Parameters
+        ----------
+        case: dict
+            parameters of the case
+        params: dict
+            extra parameters of the method (tol, itermax, ...)
+
+        Returns
+        -------
+        result: dict
+            case with wall time (s), peak memory (MiB), iterations, convergence, RMSE against the hidden values
+            and number of hidden values left missing by the method
+        """
+        data = SyntheticData(rows = case["rows"], columns = case["columns"], seed = self.seed)
+        truth = data.series()
+        df = data.gaps(truth, pattern = case["pattern"], fraction = case["fraction"])
+        missing = isnan(df.to_numpy())
+
+        times = []
+        for _ in range(self.repeat):
+            begin = perf_counter()
+            dfFilled, iterations, converged = self.fill(case, df, params)
+            times.append(perf_counter() - begin)
+
+        start() #Peak memory is measured in a separate run, tracing slows down the method
+        self.fill(case, df, params)
+        _, peak = get_traced_memory()
+        stop()
+
+        error = (dfFilled.to_numpy() - truth)[missing]
+        return dict(case, seconds = min(times), peakMemoryMiB = peak / 2**20, iterations = iterations, converged = converged,
+                    rmse = float(sqrt((error**2).mean())) if error.size else 0.0, missingValues = int(missing.sum()),
+                    unfilledValues = int(isnan(error).sum())) #Unfilled values make rmse nan instead of being ignored
+
+    def run(self, cases, params=None, verbose=True):
+        """
+        Runs all the cases
+
+        Returns
+        -------
+        report: dict
+            metadata of the run and the result of each case
+        """
+        params = params or {}
+        importResult = self.importTime()
+        if verbose:
+            print("import FillingTimeSeries: {seconds:.3f} s, heavy modules loaded: {heavyModules}".format(**importResult))
+        results = []
+        for case in cases:
+            result = self.runCase(case, params)
+            results.append(result)
+            if verbose:
+                print("{method:<10} rows={rows:<6} columns={columns:<4} {pattern:<6} fraction={fraction:<5} "
+                      "lags={lags} components={components}: {seconds:.3f} s, {peakMemoryMiB:.1f} MiB, "
+                      "rmse={rmse:.4f}, unfilled={unfilledValues}".format(**result))
+        metadata = {"version": FillingTimeSeries.__version__, "python": python_version(),
+                    "platform": platform(), "seed": self.seed, "repeat": self.repeat, "params": params, "import": importResult}
+        return {"metadata": metadata, "results": results}
+
+    def save(self, report, path):
+        """
+        Writes the report as JSON
+        """
+        with open(path, "w") as file:
+            dump(report, file, indent = 2, default = str)
+
+    def compare(self, oldPath, newPath, threshold=0.1):
+        """
+        Compares the wall time of two reports (cases and cold import)
+
+        Parameters
+        ----------
+        oldPath, newPath: str
+            paths of the reports
+        threshold: float
+            relative slowdown reported as a regression
+
+        Returns
+        -------
+        regressions: list
+            cases whose time grew more than threshold or which left missing values unfilled
+        """
+        keys = ("method", "rows", "columns", "fraction", "pattern", "lags", "components")
+        with open(oldPath) as file:
+            oldReport = load(file)
+        with open(newPath) as file:
+            newReport = load(file)
+        old = {tuple(r[k] for k in keys): r for r in oldReport["results"]}
+        new = newReport["results"]
+        regressions = []
+        oldImport, newImport = oldReport["metadata"].get("import"), newReport["metadata"].get("import")
+        if oldImport and newImport:
+            ratio = newImport["seconds"] / oldImport["seconds"]
+            print("import {:>8.3f} s -> {:>8.3f} s ({:+.1%}), heavy modules: {}".format(
+                  oldImport["seconds"], newImport["seconds"], ratio - 1, newImport["heavyModules"]))
+            if ratio - 1 > threshold or newImport["heavyModules"]:
+                regressions.append(dict(newImport, method = "import"))
+        for result in new:
+            previous = old.get(tuple(result[k] for k in keys))
+            if previous is None:
+                continue
+            ratio = result["seconds"] / previous["seconds"] if previous["seconds"] else 1.0
+            print("{} {:>8.3f} s -> {:>8.3f} s ({:+.1%})".format(
+                  " ".join(str(result[k]) for k in keys), previous["seconds"], result["seconds"], ratio - 1))
+            if ratio - 1 > threshold or result.get("unfilledValues", 0) > 0: #A fast method which leaves gaps is a regression
+                regressions.append(result)
+        return regressions
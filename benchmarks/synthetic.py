@@ -0,0 +1,98 @@
+"""
+Synthetic geophysical-like series used by the benchmarks
+"""
+
+from numpy import arange, cos, pi, sin, zeros #Handling arrays
+from numpy.random import default_rng #Reproducible random numbers
+from pandas import DataFrame #Handles datasets
+
+
+class SyntheticData:
+    """
+    Generates correlated daily series (annual cycle, shared red noise and local noise)
+    and hides part of the values with a gap pattern
+
+    Parameters
+    ----------
+    rows: int
+        Number of time steps
+    columns: int
+        Number of stations
+    seed: int
+        Seed of the random generator, the same seed gives the same data
+    """
+    patterns = ("random", "block", "edges")
+
+    def __init__(self, rows=3650, columns=10, seed=0):
+        self.rows, self.columns, self.seed = rows, columns, seed
+
+    def series(self, factors=3, phi=0.8):
+        """
+        Builds the complete series
+
+        Parameters
+        ----------
+        factors: int
+            Number of red noise signals shared by the stations
+        phi: float
+            Lag-1 autocorrelation of the shared signals
+
+        Returns
+        -------
+        truth: array
+            (rows, columns) array without missing values
+        """
+        rng = default_rng(self.seed)
+        t = arange(self.rows)
+        shared = zeros((self.rows, factors))
+        noise = rng.normal(0, 1, (self.rows, factors))
+        for index in range(1, self.rows):
+            shared[index] = phi * shared[index - 1] + noise[index]
+        loadings = rng.normal(0, 1, (factors, self.columns))
+        phase = rng.uniform(0, 2 * pi, self.columns)
+        seasonal = 5 * sin(2 * pi * t[:, None] / 365.25 + phase) + 2 * cos(4 * pi * t[:, None] / 365.25)
+        level = rng.uniform(10, 30, self.columns)
+        return level + seasonal + shared @ loadings + rng.normal(0, 0.5, (self.rows, self.columns))
+
+    def gaps(self, truth, pattern="random", fraction=0.1):
+        """
+        Hides values of the complete series
+
+        Parameters
+        ----------
+        truth: array
+            complete series
+        pattern: str
+            "random": independent missing values.
+            "block": station outages of contiguous days.
+            "edges": leading and trailing gaps (stations starting late or ending early)
+        fraction: float
+            Approximate fraction of missing values in each column
+
+        Returns
+        -------
+        df: pandas dataframe
+            dataframe with missing values
+        """
+        if pattern not in self.patterns:
+            raise AttributeError("pattern must be one of " + ", ".join(self.patterns))
+        rng = default_rng(self.seed + 1)
+        rows, columns = truth.shape
+        mask = zeros((rows, columns), dtype = bool)
+        if pattern == "random":
+            mask = rng.random((rows, columns)) < fraction
+        elif pattern == "block":
+            for column in range(columns):
+                while mask[:, column].mean() < fraction:
+                    length = int(rng.integers(5, max(6, rows // 20)))
+                    start = int(rng.integers(0, rows - length))
+                    mask[start : start + length, column] = True
+        else:
+            for column in range(columns):
+                missing = int(fraction * rows)
+                leading = int(rng.integers(0, missing + 1))
+                mask[:leading, column] = True
+                mask[rows - (missing - leading) :, column] = True
+        values = truth.copy()
+        values[mask] = float("nan")
+        return DataFrame(values, columns = ["Station" + str(column) for column in range(columns)])
@@ -1,5 +1,4 @@
-import setuptools
-from distutils.core import setup
+from setuptools import setup
 from pathlib import Path
 this_directory = Path(__file__).parent
 long_description = (this_directory / "README.md").read_text()
@@ -23,6 +22,12 @@ setup(
           'scikit-learn',
           'matplotlib',
       ],
+  extras_require={
+          'parquet': ['pyarrow'], # Only to read and write Parquet files from the command line
+      },
+  entry_points={
+          'console_scripts': ['filling-time-series=FillingTimeSeries.CommandLine:main'],
+      },
   classifiers=[
     'Development Status :: 5 - Production/Stable', # "3 - Alpha", "4 - Beta" or "5 - Production/Stable"
     'Intended Audience :: Developers', # Define that your audience are developers